@@ -0,0 +1,99 @@
+import argparse
+import time
+import uuid
+import numpy as np
+from sqlalchemy import delete
+from src.config import Config
+from src.db import SessionLocal
+from src.models import User, Document, Chunk, ChatSession, ChatMessage
+from src.models.chunks import EMBEDDING_TYPE
+from src.services.bulk_writer import insert_chunks, insert_chat_messages
+
+def chunk_rows(document_id: int, count: int, dimension: int):
+    vectors = np.random.default_rng(0).random((count, dimension), dtype=np.float32)
+    return [
+        {
+            "text": f"Synthetic chunk {i}\twith a tab, a newline\nand a backslash \\ " + "lorem ipsum " * 60,
+            "page_number": i // 10,
+            "file_name": "benchmark.pdf",
+            "chunk_index": i,
+            "content_hash": uuid.uuid4().hex,
+            "document_id": document_id,
+            "embedding": vectors[i].tolist(),  # Python floats: psycopg2 cannot adapt np.float32
+        }
+        for i in range(count)
+    ]
+
+def message_rows(session_id: int, count: int):
+    return [
+        {
+            "session_id": session_id,
+            "role": "user" if i % 2 == 0 else "bot",
+            "content": f"Message {i} " + "answer text " * 30,
+            "file_name": None if i % 2 == 0 else "benchmark.pdf",
+            "page_number": None if i % 2 == 0 else i,
+            "score": None if i % 2 == 0 else 0.5,
+        }
+        for i in range(count)
+    ]
+
+def timed(label: str, count: int, write):
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        write(db)
+        db.commit()
+        seconds = time.perf_counter() - start
+    finally:
+        db.close()
+    print(f"{label:<28} {count:>7} rows  {seconds:8.3f}s  {count / seconds:12,.0f} rows/s")
+
+def main():
+    """
+    Compare ORM add_all/commit with the bulk writer (COPY on psycopg2) for
+    chunks and chat_messages. Writes into a throwaway user that is deleted afterwards.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark chunk and chat message writes.")
+    parser.add_argument("--chunks", type=int, default=3000, help="Chunk rows per run")
+    parser.add_argument("--messages", type=int, default=3000, help="Chat message rows per run")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    suffix = uuid.uuid4().hex[:8]
+    user = User(username=f"benchmark_{suffix}", hashed_password="-")
+    db.add(user)
+    db.flush()
+    document = Document(
+        file_name="benchmark.pdf", file_type="pdf",
+        url=f"benchmark://{suffix}", public_id=f"benchmark_{suffix}", user_id=user.id
+    )
+    session = ChatSession(user_id=user.id, session_name="benchmark")
+    db.add_all([document, session])
+    db.commit()
+    user_id, document_id, session_id = user.id, document.id, session.id
+    db.close()
+
+    print(f"CHUNK_EMBEDDING_STORAGE={Config.CHUNK_EMBEDDING_STORAGE}, dimension={Config.EMBEDDING_DIMENSION}")
+    chunks = chunk_rows(document_id, args.chunks, Config.EMBEDDING_DIMENSION)
+    messages = message_rows(session_id, args.messages)
+    try:
+        def orm_chunks(db):
+            db.add_all([
+                Chunk(**{k: v for k, v in row.items() if k != "embedding" or EMBEDDING_TYPE is not None})
+                for row in chunks
+            ])
+
+        timed("chunks: ORM add_all", len(chunks), orm_chunks)
+        timed("chunks: bulk writer", len(chunks), lambda db: insert_chunks(db, chunks))
+        timed("chat_messages: ORM add_all", len(messages), lambda db: db.add_all([ChatMessage(**row) for row in messages]))
+        timed("chat_messages: bulk writer", len(messages), lambda db: insert_chat_messages(db, messages))
+    finally:
+        db = SessionLocal()
+        try:
+            db.execute(delete(User).where(User.id == user_id))  # cascades to documents, chunks and chat history
+            db.commit()
+        finally:
+            db.close()
+
+if __name__ == "__main__":
+    main()
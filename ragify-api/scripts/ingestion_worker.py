@@ -0,0 +1,22 @@
+import argparse
+import asyncio
+from src.config import Config
+from src.services.ingestion_queue import IngestionWorkerPool
+
+def main():
+    """
+    Standalone ingestion worker process. Run one or more of these (with
+    INGEST_RUN_IN_API=false on the API) to scale ingestion separately from the web workers.
+    """
+    parser = argparse.ArgumentParser(description="Process queued document uploads.")
+    parser.add_argument("--concurrency", type=int, default=Config.INGEST_WORKERS, help="Jobs processed at once")
+    args = parser.parse_args()
+
+    pool = IngestionWorkerPool(concurrency=args.concurrency)
+    try:
+        asyncio.run(pool.run_forever())
+    except KeyboardInterrupt:
+        print("Ingestion worker stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+from qdrant_client.http import models as rest
+from src.config import Config
+from src.vector_db.qdrant_connection import get_qdrant_client
+from src.vector_db.collection_profiles import COLLECTION_PROFILES, get_profile
+
+def migrate_collection(client, collection_name: str, profile):
+    """
+    Apply a profile to an existing collection in place.
+    Qdrant rebuilds the affected segments (quantization, HNSW, on-disk storage) in the background.
+    The shared collection keeps its per-tenant HNSW layout (m=0, payload_m).
+    """
+    tenant_indexed = collection_name == Config.QDRANT_SHARED_COLLECTION
+    client.update_collection(
+        collection_name=collection_name,
+        vectors_config={
+            "": rest.VectorParamsDiff(on_disk=profile.on_disk_vectors)
+        },
+        hnsw_config=profile.hnsw_config(tenant_indexed=tenant_indexed),
+        quantization_config=profile.quantization_config() or rest.Disabled.DISABLED,
+        collection_params=rest.CollectionParamsDiff(on_disk_payload=profile.on_disk_payload)
+    )
+    print(f"✅ {collection_name} → profile '{profile.name}'{' (per-tenant HNSW)' if tenant_indexed else ''}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert existing Qdrant collections to a collection profile.")
+    parser.add_argument("--profile", required=True, choices=sorted(COLLECTION_PROFILES))
+    parser.add_argument("--collection", action="append", default=[], help="Collection to migrate (repeatable)")
+    parser.add_argument("--all", action="store_true", help="Migrate every collection_* collection")
+    args = parser.parse_args()
+
+    client = get_qdrant_client()
+    profile = get_profile(args.profile)
+
+    collections = list(args.collection)
+    if args.all:
+        collections += [
+            c.name for c in client.get_collections().collections
+            if c.name.startswith("collection_") and c.name not in collections
+        ]
+    if not collections:
+        parser.error("pass --collection NAME or --all")
+
+    for name in collections:
+        migrate_collection(client, name, profile)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import uuid
+from qdrant_client.models import FieldCondition, Filter, MatchValue
+from src.config import Config
+from src.db import SessionLocal
+from src.models.users import User
+from src.vector_db.qdrant_connection import get_qdrant_client
+from src.vector_db.qdrant_manager import POINT_ID_NAMESPACE, TENANT_KEY, UserCollectionManager
+
+def target_point_id(point, tenant_id: str) -> str:
+    """
+    ID of a migrated point. Points carrying a document_id already have the
+    globally unique ID ingestion assigns, so they keep it; legacy points
+    (file name only) get one derived from the tenant and their source ID, since
+    re-deriving from the payload would collide across scroll pages.
+    """
+    if "document_id" in (point.payload or {}):
+        return str(point.id)
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{tenant_id}:{point.id}"))
+
+def migrate_collection(client, collection_name: str, tenant_id: str, batch_size: int = 256) -> int:
+    """
+    Copy every point of a per-user collection into the shared collection under `tenant_id`.
+    Target IDs come from the source point IDs, so re-running the migration is idempotent.
+    """
+    target = UserCollectionManager(
+        client, Config.QDRANT_SHARED_COLLECTION, Config.EMBEDDING_DIMENSION, tenant_id=tenant_id
+    )
+    moved = 0
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=[""]
+        )
+        if points:
+            vectors = [p.vector[""] if isinstance(p.vector, dict) else p.vector for p in points]
+            # BM25 vectors are recomputed from the payload text by insert_data
+            target.insert_data(
+                vectors,
+                [p.payload for p in points],
+                ids=[target_point_id(p, tenant_id) for p in points],
+                batch_size=batch_size
+            )
+            moved += len(points)
+        if offset is None:
+            return moved
+
+def main():
+    parser = argparse.ArgumentParser(description="Move per-user collection_* data into the shared multitenant collection.")
+    parser.add_argument("--user", action="append", default=[], help="Username to migrate (repeatable); all users when omitted")
+    parser.add_argument("--delete-source", action="store_true", help="Drop each per-user collection once it is copied")
+    args = parser.parse_args()
+
+    client = get_qdrant_client()
+    db = SessionLocal()
+    try:
+        query = db.query(User)
+        if args.user:
+            query = query.filter(User.username.in_(args.user))
+        users = query.all()
+    finally:
+        db.close()
+
+    # Creates the shared collection (tenant index, per-tenant HNSW) if missing
+    UserCollectionManager(client, Config.QDRANT_SHARED_COLLECTION, Config.EMBEDDING_DIMENSION).create_collection()
+
+    for user in users:
+        if not client.collection_exists(user.collection):
+            print(f"⚠️ {user.collection} does not exist, skipping {user.username}")
+            continue
+        tenant_id = str(user.id)
+        moved = migrate_collection(client, user.collection, tenant_id)
+        source_count = client.count(collection_name=user.collection, exact=True).count
+        target_count = client.count(
+            collection_name=Config.QDRANT_SHARED_COLLECTION,
+            count_filter=Filter(must=[FieldCondition(key=TENANT_KEY, match=MatchValue(value=tenant_id))]),
+            exact=True
+        ).count
+        print(f"✅ {user.collection} → {Config.QDRANT_SHARED_COLLECTION} ({moved} points, user_id={user.id})")
+        if moved != source_count or target_count < source_count:
+            print(f"❌ {user.collection}: {source_count} source points but {target_count} for user_id={user.id} "
+                  f"in {Config.QDRANT_SHARED_COLLECTION}; keeping the source collection")
+            continue
+        if args.delete_source:
+            client.delete_collection(user.collection)
+            print(f"🗑️ Dropped {user.collection}")
+
+    print("Set QDRANT_STORAGE_LAYOUT=shared to serve requests from the shared collection.")
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,35 @@
 from sqlalchemy import create_engine, text
+import argparse
 import os
 from dotenv import load_dotenv
 
 # Import your database setup and models
+from src.config import Config
 from src.db import Base, engine
 from src.models.users import User
 from src.models.documents import Document
 from src.models.chunks import Chunk
 from src.models.chat_message import ChatSession, ChatMessage  # new models
+from src.models.ingestion_jobs import IngestionJob
+from src.models.vector_types import to_float32_bytes
 
 # Load environment variables
 load_dotenv()
 
+parser = argparse.ArgumentParser(description="Create and migrate the RAGify tables.")
+parser.add_argument(
+    "--drop-chunk-embeddings", action="store_true",
+    help="With CHUNK_EMBEDDING_STORAGE=none, drop chunks.embedding (irreversible; vectors stay in Qdrant)"
+)
+args = parser.parse_args()
+
 # 1️⃣ Ensure base tables from models exist
+if Config.CHUNK_EMBEDDING_STORAGE == "pgvector":
+    with engine.connect() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        conn.commit()
 Base.metadata.create_all(engine)
-print("✅ Base tables created (users, documents, chunks, chat sessions).")
+print("✅ Base tables created (users, documents, chunks, chat sessions, ingestion jobs).")
 
 # 2️⃣ Custom SQL migrations
 migration_sql = [
@@ -30,6 +45,10 @@ migration_sql = [
         END IF;
     END $$;
     """,
+    # Content version of each user's documents (semantic cache key)
+    """
+    ALTER TABLE users ADD COLUMN IF NOT EXISTS content_version INTEGER NOT NULL DEFAULT 0;
+    """,
     # Create chunks table (if not exists)
     """
     CREATE TABLE IF NOT EXISTS chunks (
@@ -41,6 +60,11 @@ migration_sql = [
         document_id INTEGER REFERENCES documents(id) ON DELETE CASCADE
     );
     """,
+    # Per-chunk position and content hash used by incremental re-ingestion
+    """
+    ALTER TABLE chunks ADD COLUMN IF NOT EXISTS chunk_index INTEGER;
+    ALTER TABLE chunks ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+    """,
     # Create chat_sessions table
     """
     CREATE TABLE IF NOT EXISTS chat_sessions (
@@ -62,13 +86,128 @@ migration_sql = [
         score DOUBLE PRECISION,
         created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
     );
+    """,
+    # Create ingestion_jobs table (upload queue)
+    """
+    CREATE TABLE IF NOT EXISTS ingestion_jobs (
+        id SERIAL PRIMARY KEY,
+        user_id INTEGER REFERENCES users(id) ON DELETE CASCADE NOT NULL,
+        file_name VARCHAR NOT NULL,
+        file_path VARCHAR NOT NULL,
+        status VARCHAR NOT NULL DEFAULT 'queued',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        error TEXT,
+        document_id INTEGER REFERENCES documents(id) ON DELETE SET NULL,
+        worker_id VARCHAR,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+        started_at TIMESTAMP WITH TIME ZONE,
+        finished_at TIMESTAMP WITH TIME ZONE
+    );
+    CREATE INDEX IF NOT EXISTS ix_ingestion_jobs_status_created ON ingestion_jobs (status, created_at);
+    CREATE INDEX IF NOT EXISTS ix_ingestion_jobs_user_created ON ingestion_jobs (user_id, created_at);
     """
 ]
 
-# 3️⃣ Execute the migrations
+# 3️⃣ Chunk embedding column, per CHUNK_EMBEDDING_STORAGE
+EMBEDDING_COLUMN_SQL = {
+    "float32": "BYTEA",
+    "pgvector": f"vector({Config.EMBEDDING_DIMENSION})",
+    "array": "DOUBLE PRECISION[]",
+}
+EMBEDDING_DATA_TYPES = {"float32": "bytea", "pgvector": "USER-DEFINED", "array": "ARRAY"}
+
+def column_type(conn, column: str):
+    return conn.execute(text(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_name='chunks' AND column_name=:column"
+    ), {"column": column}).scalar()
+
+def backfill_float32(conn, batch_size: int = 1000):
+    """
+    Re-encode DOUBLE PRECISION[] embeddings (embedding_legacy) into the bytea
+    column, in id order. Rows already converted are skipped, so an interrupted
+    run resumes where it stopped.
+    """
+    last_id = 0
+    converted = 0
+    while True:
+        rows = conn.execute(text(
+            "SELECT id, embedding_legacy FROM chunks "
+            "WHERE id > :last_id AND embedding IS NULL AND embedding_legacy IS NOT NULL ORDER BY id LIMIT :limit"
+        ), {"last_id": last_id, "limit": batch_size}).all()
+        if not rows:
+            return converted
+        conn.execute(
+            text("UPDATE chunks SET embedding = :embedding WHERE id = :id"),
+            [{"id": row.id, "embedding": to_float32_bytes(row.embedding_legacy)} for row in rows]
+        )
+        conn.commit()
+        last_id = rows[-1].id
+        converted += len(rows)
+
+def finish_float32(conn):
+    """Backfill the bytea column from embedding_legacy, then drop the legacy column."""
+    converted = backfill_float32(conn)
+    conn.execute(text("ALTER TABLE chunks DROP COLUMN embedding_legacy"))
+    print(f"✅ Converted {converted} chunk embeddings to float32 bytea.")
+
+def migrate_chunk_embeddings(conn, mode: str = Config.CHUNK_EMBEDDING_STORAGE, drop: bool = False):
+    current = column_type(conn, "embedding")
+    legacy = column_type(conn, "embedding_legacy")
+
+    if legacy is not None:
+        # A float32 conversion was interrupted after the rename
+        if mode != "float32":
+            print("⚠️ chunks.embedding_legacy exists from an unfinished float32 conversion; "
+                  "rerun with CHUNK_EMBEDDING_STORAGE=float32 to finish it.")
+            return
+        if current is None:
+            conn.execute(text("ALTER TABLE chunks ADD COLUMN embedding BYTEA"))
+            conn.commit()
+        finish_float32(conn)
+        return
+
+    if mode == "none":
+        if current is not None:
+            if not drop:
+                print("⚠️ CHUNK_EMBEDDING_STORAGE=none: keeping chunks.embedding; "
+                      "pass --drop-chunk-embeddings to drop it (irreversible).")
+                return
+            conn.execute(text("ALTER TABLE chunks DROP COLUMN embedding"))
+            print("✅ Dropped chunks.embedding (vectors live in Qdrant only).")
+        return
+    if current is None:
+        conn.execute(text(f"ALTER TABLE chunks ADD COLUMN embedding {EMBEDDING_COLUMN_SQL[mode]}"))
+        print(f"✅ Added chunks.embedding as {EMBEDDING_COLUMN_SQL[mode]}.")
+        return
+    if current == EMBEDDING_DATA_TYPES[mode]:
+        conn.execute(text("ALTER TABLE chunks ALTER COLUMN embedding DROP NOT NULL"))
+        return
+    if current != "ARRAY":
+        print(f"⚠️ chunks.embedding is {current}; converting it to {mode} is not supported, drop the column first.")
+        return
+
+    # Legacy DOUBLE PRECISION[] column
+    conn.execute(text("ALTER TABLE chunks ALTER COLUMN embedding DROP NOT NULL"))
+    if mode == "pgvector":
+        conn.execute(text(
+            f"ALTER TABLE chunks ALTER COLUMN embedding TYPE {EMBEDDING_COLUMN_SQL[mode]} "
+            f"USING embedding::real[]::{EMBEDDING_COLUMN_SQL[mode]}"
+        ))
+        print("✅ Converted chunks.embedding to pgvector.")
+    else:
+        # Rename and add in one commit: from here on a rerun resumes through embedding_legacy
+        conn.execute(text("ALTER TABLE chunks RENAME COLUMN embedding TO embedding_legacy"))
+        conn.execute(text("ALTER TABLE chunks ADD COLUMN embedding BYTEA"))
+        conn.commit()
+        finish_float32(conn)
+
+# 4️⃣ Execute the migrations
 with engine.connect() as conn:
     for sql in migration_sql:
         conn.execute(text(sql))
     conn.commit()
+    migrate_chunk_embeddings(conn, drop=args.drop_chunk_embeddings)
+    conn.commit()
 
 print("✅ Migration completed successfully.")
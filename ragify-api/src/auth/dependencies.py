@@ -1,26 +1,44 @@
+from typing import Union
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from src.auth.jwt import decode_access_token  
-from src.db import get_db
-from sqlalchemy.orm import Session
-from src.models.users import User
+from src.auth.user_cache import CachedUser, user_cache
+from src.config import Config
+from src.db import AsyncSessionLocal
+from sqlalchemy import select
+from src.models.users import User, RoleEnum
 
 security = HTTPBearer()  
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
-    token = credentials.credentials
-    try:
-        payload = decode_access_token(token)  
-        username = payload.get("sub")
-        if not username:
-            raise HTTPException(status_code=401, detail="Invalid token")
-    except Exception:
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Union[User, CachedUser]:
+    """
+    Resolve the bearer token to a user. Repeat requests with the same token are
+    served from user_cache, so authentication usually needs no DB round-trip;
+    those get a read-only CachedUser with the same id/username/role/collection.
+    """
+    payload = decode_access_token(credentials.credentials)
+    username = payload.get("sub") if payload else None
+    if not username:
         raise HTTPException(status_code=401, detail="Invalid token")
+    issued_at = payload.get("iat")
 
-    user = db.query(User).filter(User.username == username).first()
+    if Config.USER_CACHE_ENABLED:
+        user = user_cache.get(username, issued_at)
+        if user is not None:
+            return user
+
+    async with AsyncSessionLocal() as db:
+        user = await db.scalar(select(User).where(User.username == username))
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
+    if Config.USER_CACHE_ENABLED:
+        return user_cache.put(username, issued_at, user)
+    return user
+
+def get_current_admin(user: User = Depends(get_current_user)):
+    if user.role != RoleEnum.admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to access this resource",
+        )
     return user
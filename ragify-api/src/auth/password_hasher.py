@@ -0,0 +1,130 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+from src.auth.security import hash_password, verify_password
+from src.config import Config
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full; the request should be retried later (HTTP 503)."""
+
+
+class PasswordHasher:
+    """
+    bcrypt on a dedicated, size-bounded executor.
+
+    Hashing never runs on the default thread pool, so a login burst cannot
+    starve other asyncio.to_thread users. The process pool (default) also
+    keeps bcrypt off the API process's GIL. At most `workers + max_queue`
+    operations are accepted; beyond that calls fail fast with PasswordHasherBusy.
+
+    in_flight counts work the executor still holds: a request cancelled while
+    bcrypt is already running keeps its slot until the worker finishes.
+    """
+
+    def __init__(
+        self,
+        workers: int = Config.PASSWORD_HASH_WORKERS,
+        max_queue: int = Config.PASSWORD_HASH_MAX_QUEUE,
+        executor: str = Config.PASSWORD_HASH_EXECUTOR
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor_kind = executor
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()  # done callbacks run on executor threads
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.restarts = 0
+        self.rejected = 0
+        self.total_ms = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                # spawn: forking a process that already runs threads (event loop, HTTP pools) is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    def _reset_executor(self, broken: Executor):
+        """Replace a pool whose worker died; concurrent callers reset it only once."""
+        if self._executor is broken:
+            self._executor = None
+            self.restarts += 1
+            broken.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, future: Future):
+        with self._lock:
+            self.in_flight -= 1
+
+    def _submit(self, executor: Executor, fn, *args) -> Future:
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusy("Too many concurrent password operations")
+            self.in_flight += 1
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            with self._lock:
+                self.in_flight -= 1
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def _run(self, fn, *args):
+        start = time.perf_counter()
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                result = await asyncio.wrap_future(self._submit(executor, fn, *args))
+                break
+            except BrokenExecutor:
+                # A worker process died (OOM kill, segfault): rebuild the pool and retry once
+                self._reset_executor(executor)
+                if attempt == 1:
+                    self.failed += 1
+                    raise
+            except Exception:
+                self.failed += 1
+                raise
+        self.completed += 1
+        self.total_ms += (time.perf_counter() - start) * 1000
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.executor_kind,
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.workers),
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "restarts": self.restarts,
+            "avg_ms": round(self.total_ms / self.completed, 2) if self.completed else 0.0,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance
+password_hasher = PasswordHasher()
@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from src.config import Config
+from src.models.users import RoleEnum, User
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """
+    Read-only copy of the User columns request handlers read. It is not an ORM
+    object, carries no password hash and cannot be modified, so one instance is
+    safe to share between concurrent requests.
+    """
+
+    id: int
+    username: str
+    role: RoleEnum
+    collection: Optional[str]
+
+
+def snapshot_user(user: User) -> CachedUser:
+    return CachedUser(id=user.id, username=user.username, role=user.role, collection=user.collection)
+
+
+class UserCache:
+    """
+    Authenticated users keyed by (username, token iat), LRU bounded.
+
+    Entries are dropped once a transaction that updated or deleted the user
+    row through the ORM in this process commits; other processes see the
+    change once `ttl` expires.
+    """
+
+    def __init__(self, ttl: float = Config.USER_CACHE_TTL, max_entries: int = Config.USER_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Optional[int]], Tuple[CachedUser, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, username: str, issued_at: Optional[int]) -> Optional[CachedUser]:
+        key = (username, issued_at)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[1] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, username: str, issued_at: Optional[int], user: User) -> CachedUser:
+        snapshot = snapshot_user(user)
+        with self._lock:
+            self._entries[(username, issued_at)] = (snapshot, time.monotonic())
+            self._entries.move_to_end((username, issued_at))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, user_id: int):
+        """Drop every cached token of the user (under any username it had)."""
+        with self._lock:
+            for key in [k for k, (user, _) in self._entries.items() if user.id == user_id]:
+                del self._entries[key]
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+        }
+
+
+# Singleton instance
+user_cache = UserCache()
+
+
+# ---------------- Invalidation ----------------
+# Changes are collected per session while it flushes and applied after commit:
+# invalidating at flush time would let a concurrent request re-cache the old
+# row before the transaction commits (or drop entries for a rolled back change).
+_PENDING_USER_IDS = "user_cache_pending_user_ids"
+_PENDING_CLEAR = "user_cache_pending_clear"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_user(mapper, connection, target):
+    session = object_session(target)
+    if session is None:
+        return
+    # By id: a rename is caught even when the old username was never loaded
+    session.info.setdefault(_PENDING_USER_IDS, set()).add(target.id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_write(orm_execute_state):
+    # Bulk UPDATE/DELETE statements bypass the mapper events
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and any(
+        mapper.class_ is User for mapper in orm_execute_state.all_mappers
+    ):
+        orm_execute_state.session.info[_PENDING_CLEAR] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    user_ids = session.info.pop(_PENDING_USER_IDS, set())
+    if session.info.pop(_PENDING_CLEAR, False):
+        user_cache.clear()
+        return
+    for user_id in user_ids:
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop(_PENDING_USER_IDS, None)
+        session.info.pop(_PENDING_CLEAR, None)
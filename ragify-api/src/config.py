@@ -8,6 +8,25 @@ class Config:
     PORT = int(os.getenv("PORT", 8000))
     CLIENT_URL = os.getenv("CLIENT_URL", "http://localhost:5173")
     UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+
+    # Database connection pools (per engine, per worker process)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    # asyncpg prepared statement cache per connection; set 0 behind PgBouncer in transaction mode
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 500))
+    # Copy of chunk embeddings kept in Postgres (vectors are served from Qdrant):
+    # "array" (DOUBLE PRECISION[], the original layout), "float32" (bytea), "pgvector" (vector column) or "none"
+    CHUNK_EMBEDDING_STORAGE = os.getenv("CHUNK_EMBEDDING_STORAGE", "array")
+
+    # Ingestion job queue (ingestion_jobs table)
+    INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", 2))                    # concurrent jobs per worker process
+    INGEST_RUN_IN_API = os.getenv("INGEST_RUN_IN_API", "true").lower() == "true"  # false: run scripts/ingestion_worker.py
+    INGEST_MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", 3))
+    INGEST_POLL_INTERVAL = float(os.getenv("INGEST_POLL_INTERVAL", 1.0))
+    INGEST_STALE_AFTER = int(os.getenv("INGEST_STALE_AFTER", 1800))         # seconds before a running job is reclaimed
+    INGEST_MAX_FILES = int(os.getenv("INGEST_MAX_FILES", 20))               # files per multi-file upload
     
     # POSTGRES
     POSTGRES_URI = os.getenv("POSTGRES_URI")
@@ -17,12 +36,61 @@ class Config:
     ALGORITHM = os.getenv("ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 
+    # Authenticated user cache (per process; changes made elsewhere show up after the TTL)
+    USER_CACHE_ENABLED = os.getenv("USER_CACHE_ENABLED", "true").lower() == "true"
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 60))
+    USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", 10000))
+
+    # bcrypt hashing pool: "process" or "thread"; calls beyond workers + max queue get a 503
+    PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "process")
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 32))
+
     # OpenAI
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     OPENAI_CHAT_MODEL = os.getenv("OPENAI_CHAT_MODEL")
     OPENAI_EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL")
     OPENAI_EMBEDDING_DIMENSION = os.getenv("OPENAI_EMBEDDING_DIMENSION")
 
+    # LLM generation (one pooled async HTTP client per worker)
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 60))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 2))
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 256))
+    LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", 256))
+    # Max tokens of retrieved context packed into one prompt
+    LLM_CONTEXT_TOKEN_BUDGET = int(os.getenv("LLM_CONTEXT_TOKEN_BUDGET", 3000))
+
+    # Embedding backend: "openai", "hashing" (deterministic, offline) or "sentence_transformers"
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai")
+    EMBEDDING_DIMENSION = int(os.getenv("EMBEDDING_DIMENSION") or os.getenv("OPENAI_EMBEDDING_DIMENSION") or 1536)
+    LOCAL_EMBEDDING_MODEL = os.getenv("LOCAL_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+    # Embedding scheduler (shared by all concurrent uploads and queries)
+    EMBEDDING_MAX_CONCURRENCY = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", 4))
+    EMBEDDING_MAX_BATCH_TOKENS = int(os.getenv("EMBEDDING_MAX_BATCH_TOKENS", 50000))
+    EMBEDDING_MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", 2048))
+    EMBEDDING_MAX_RETRIES = int(os.getenv("EMBEDDING_MAX_RETRIES", 5))
+
+    # Embedding cache (empty EMBEDDING_CACHE_PATH keeps the cache in memory only)
+    EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    EMBEDDING_CACHE_MAX_ITEMS = int(os.getenv("EMBEDDING_CACHE_MAX_ITEMS", 5000))
+    EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "cache/embeddings.sqlite3")
+
+    # Semantic answer cache for /search
+    SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.95))
+    SEMANTIC_CACHE_TTL = int(os.getenv("SEMANTIC_CACHE_TTL", 3600))
+    SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", 500))              # per (collection, variant)
+    SEMANTIC_CACHE_MAX_TOTAL_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_TOTAL_ENTRIES", 10000))  # across all collections
+
+    # Re-ranking after vector search: "none", "lexical" or "cross_encoder"
+    RERANKER = os.getenv("RERANKER", "none")
+    RERANK_MODEL = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+    RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", 20))
+
+    # Max questions per POST /search/batch
+    SEARCH_BATCH_MAX_QUERIES = int(os.getenv("SEARCH_BATCH_MAX_QUERIES", 64))
+
     # Cloudflare R2
     R2_ACCESS_KEY = os.getenv("R2_ACCESS_KEY")
     R2_SECRET_KEY = os.getenv("R2_SECRET_KEY")
@@ -33,3 +101,21 @@ class Config:
     # Qdrant
     QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
     QDRANT_URL = os.getenv("QDRANT_URL")
+    QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", 10))
+    QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+    QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", 6334))
+    QDRANT_POOL_SIZE = int(os.getenv("QDRANT_POOL_SIZE", 100))
+    # Collection profile: default | large | compact | binary (see src/vector_db/collection_profiles.py)
+    QDRANT_COLLECTION_PROFILE = os.getenv("QDRANT_COLLECTION_PROFILE", "default")
+    # Optional overrides of the profile's HNSW settings (unset: keep the profile's values)
+    QDRANT_HNSW_M = int(os.getenv("QDRANT_HNSW_M")) if os.getenv("QDRANT_HNSW_M") else None
+    QDRANT_HNSW_EF_CONSTRUCT = int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT")) if os.getenv("QDRANT_HNSW_EF_CONSTRUCT") else None
+    QDRANT_SEARCH_EF = int(os.getenv("QDRANT_SEARCH_EF")) if os.getenv("QDRANT_SEARCH_EF") else None
+    QDRANT_UPSERT_PARALLELISM = int(os.getenv("QDRANT_UPSERT_PARALLELISM", 4))
+    QDRANT_COLLECTION_CACHE_TTL = int(os.getenv("QDRANT_COLLECTION_CACHE_TTL", 300))
+    # Storage layout: "per_user" (collection_<username>) or "shared" (one collection, filtered by user_id)
+    QDRANT_STORAGE_LAYOUT = os.getenv("QDRANT_STORAGE_LAYOUT", "per_user")
+    QDRANT_SHARED_COLLECTION = os.getenv("QDRANT_SHARED_COLLECTION", "ragify_shared")
+    # Cross-collection (admin) search: per-request deadline in seconds and max in-flight collection queries
+    QDRANT_FANOUT_DEADLINE = float(os.getenv("QDRANT_FANOUT_DEADLINE", 3.0))
+    QDRANT_FANOUT_CONCURRENCY = int(os.getenv("QDRANT_FANOUT_CONCURRENCY", 32))
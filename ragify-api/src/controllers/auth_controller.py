@@ -1,32 +1,29 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.users import User, RoleEnum
-from src.auth.security import hash_password, verify_password
+from src.auth.password_hasher import password_hasher
 from src.auth.jwt import create_access_token
-import asyncio
 
-async def register_user(db: Session, username: str, password: str, role: RoleEnum):
-    def sync_register():
-        existing_user = db.query(User).filter(User.username == username).first()
-        if existing_user:
-            return None
-        new_user = User(
-            username=username,
-            hashed_password=hash_password(password),
-            role=role
-        )
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-        return new_user
+async def register_user(db: AsyncSession, username: str, password: str, role: RoleEnum):
+    existing_user = await db.scalar(select(User).where(User.username == username))
+    if existing_user:
+        return None
 
-    return await asyncio.to_thread(sync_register)
+    # bcrypt runs on the dedicated hashing pool (raises PasswordHasherBusy when saturated)
+    hashed_password = await password_hasher.hash(password)
+    new_user = User(
+        username=username,
+        hashed_password=hashed_password,
+        role=role
+    )
+    db.add(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    return new_user
 
-async def authenticate_user(db: Session, username: str, password: str):
-    def sync_auth():
-        user = db.query(User).filter(User.username == username).first()
-        if not user or not verify_password(password, user.hashed_password):
-            return None
-        token = create_access_token({"sub": user.username, "role": user.role.value})
-        return {"user": user, "token": token}
-
-    return await asyncio.to_thread(sync_auth)
+async def authenticate_user(db: AsyncSession, username: str, password: str):
+    user = await db.scalar(select(User).where(User.username == username))
+    if not user or not await password_hasher.verify(password, user.hashed_password):
+        return None
+    token = create_access_token({"sub": user.username, "role": user.role.value})
+    return {"user": user, "token": token}
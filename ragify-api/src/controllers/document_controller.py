@@ -1,11 +1,19 @@
 import os
 from fastapi import UploadFile
+from sqlalchemy import select, delete
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.documents import Document
 from src.models.chunks import Chunk
 from src.models.users import User
 from src.services.cloudflare_r2_service import upload_to_r2, delete_from_r2
-from src.services.document_store_service import DocumentStore
+from src.services.incremental_ingest import reingest_document
+from src.services.content_version import invalidate_user_content, invalidate_user_content_async
+from src.services.ingestion_queue import job_to_dict
+from src.models.ingestion_jobs import IngestionJob
+from src.utils.async_utils import call_maybe_async
+from src.utils.file_utils import save_upload_to_disk
+from typing import List
 import asyncio
 
 # ---------------- Upload to R2 + DB + Vector ----------------
@@ -20,94 +28,209 @@ async def upload_document_to_r2(
 
     mime_type, _ = mimetypes.guess_type(file.filename)
     file_type = mime_type or os.path.splitext(file.filename)[1].lstrip('.') or "unknown"
+    user_id = current_user.id
+
+    def find_existing():
+        return db.query(Document).filter(
+            Document.user_id == user_id, Document.file_name == file.filename
+        ).first()
+
+    existing: Document = await asyncio.to_thread(find_existing)
 
     # Upload to R2
     uploaded_file = await upload_to_r2(file)
     if not uploaded_file or not uploaded_file.get("url") or not uploaded_file.get("key"):
         raise ValueError("R2 upload failed")
 
-    # Store in vector DB + SQL DB in background thread
-    async def add_doc():
-        doc_store = DocumentStore(user=current_user, collection_manager=collection_manager)
-        document: Document = await doc_store.add_document(
+    if existing:
+        return await reupload_document(
             db=db,
+            document=existing,
             file_path=file_path,
+            file_type=file_type,
+            uploaded_file=uploaded_file,
+            collection_manager=collection_manager
+        )
+
+    def create_document():
+        document = Document(
             file_name=file.filename,
-            extra_metadata={
-                "file_type": file_type,
-                "url": uploaded_file["url"],
-                "public_id": uploaded_file["key"]
-            }
+            file_type=file_type,
+            url=uploaded_file["url"],
+            public_id=uploaded_file["key"],
+            user_id=user_id
         )
+        db.add(document)
+        db.commit()
+        db.refresh(document)
         return document
 
-    document = await add_doc()
+    try:
+        document: Document = await asyncio.to_thread(create_document)
+    except Exception:
+        await asyncio.to_thread(delete_uploaded_object, uploaded_file["key"])
+        raise
+    document_id = document.id
+
+    # Stream into vector DB + SQL DB; a document without chunk rows is ingested in full
+    try:
+        stats = await reingest_document(
+            db=db,
+            document=document,
+            file_path=file_path,
+            collection_manager=collection_manager,
+            extra_payload={"file_type": file_type}
+        )
+    except Exception:
+        await remove_partial_document(db, document_id, file.filename, uploaded_file["key"], collection_manager)
+        raise
+    await asyncio.to_thread(invalidate_user_content, db, user_id, collection_manager.namespace)
 
     return {
-        "id": document.id,
-        "file_name": document.file_name,
+        "id": document_id,
+        "file_name": file.filename,
         "file_type": file_type,
         "url": uploaded_file["url"],
-        "public_id": uploaded_file["key"]
+        "public_id": uploaded_file["key"],
+        "chunks": stats
     }
 
-# ---------------- Process document in background ----------------
-async def process_document_upload(file: UploadFile, file_path: str, db: Session, current_user: User, collection_manager):
+def delete_uploaded_object(public_id: str):
+    """Best-effort removal of an R2 object; a cleanup failure must not hide the error being handled."""
     try:
-        doc_meta = await upload_document_to_r2(
-            file=file,
-            file_path=file_path,
+        delete_from_r2(public_id)
+    except Exception as e:
+        print(f"⚠️ Could not delete R2 object {public_id}: {e}")
+
+async def remove_partial_document(db: Session, document_id: int, file_name: str, public_id: str, collection_manager):
+    """Undo a first upload whose ingestion failed part way (batches are committed as they land)."""
+    def remove_rows():
+        db.rollback()
+        db.execute(delete(Chunk).where(Chunk.document_id == document_id))
+        db.execute(delete(Document).where(Document.id == document_id))
+        db.commit()
+
+    try:
+        await asyncio.to_thread(remove_rows)
+        await call_maybe_async(collection_manager.delete_by_file_name, file_name)
+    finally:
+        await asyncio.to_thread(delete_uploaded_object, public_id)
+
+# ---------------- Re-upload of an existing document ----------------
+async def reupload_document(
+    db: Session,
+    document: Document,
+    file_path: str,
+    file_type: str,
+    uploaded_file: dict,
+    collection_manager
+) -> dict:
+    """
+    Replace a document's file, re-embedding only the chunks that changed.
+    The new R2 object is deleted if anything fails before the document points
+    to it; the old one is deleted once it does.
+    """
+    # Read before the batch commits below expire the instance
+    document_id, file_name, user_id = document.id, document.file_name, document.user_id
+
+    def sync_update():
+        old_public_id = document.public_id
+        document.file_type = file_type
+        document.url = uploaded_file["url"]
+        document.public_id = uploaded_file["key"]
+        db.commit()
+        return old_public_id
+
+    try:
+        stats = await reingest_document(
             db=db,
-            current_user=current_user,
-            collection_manager=collection_manager
+            document=document,
+            file_path=file_path,
+            collection_manager=collection_manager,
+            extra_payload={"file_type": file_type}
         )
-        print("Document processed:", doc_meta)
-    finally:
-        # Delete local file asynchronously
-        if file_path and isinstance(file_path, str) and os.path.exists(file_path):
-            await asyncio.to_thread(os.remove, file_path)
-            print("Local file deleted:", file_path)
+        await asyncio.to_thread(invalidate_user_content, db, user_id, collection_manager.namespace)
+        old_public_id = await asyncio.to_thread(sync_update)
+    except Exception:
+        await asyncio.to_thread(db.rollback)
+        await asyncio.to_thread(delete_uploaded_object, uploaded_file["key"])
+        raise
 
-# ---------------- Delete Document ----------------
-async def delete_document_r2(db: Session, current_user: User, doc_id: int, collection_manager) -> bool:
-    def sync_delete():
-        doc: Document = db.query(Document).filter(
-            Document.id == doc_id, Document.user_id == current_user.id
-        ).first()
-        if not doc:
-            raise ValueError("Document not found")
-        if not doc.public_id:
-            raise ValueError("Cannot delete: public_id is empty")
+    if old_public_id and old_public_id != uploaded_file["key"]:
+        await asyncio.to_thread(delete_uploaded_object, old_public_id)
+
+    return {
+        "id": document_id,
+        "file_name": file_name,
+        "file_type": file_type,
+        "url": uploaded_file["url"],
+        "public_id": uploaded_file["key"],
+        "chunks": stats
+    }
 
-        # Remove from vector DB
-        collection_manager.delete_by_file_name(doc.file_name)
+# ---------------- Queue uploads for the ingestion workers ----------------
+async def enqueue_document_uploads(files: List[UploadFile], db: AsyncSession, current_user: User) -> List[dict]:
+    """Save each upload to disk and queue an ingestion job for it."""
+    saved = []
+    try:
+        for file in files:
+            saved.append((file.filename, await save_upload_to_disk(file, unique=True)))
+        jobs = [
+            IngestionJob(user_id=current_user.id, file_name=name, file_path=path, status="queued")
+            for name, path in saved
+        ]
+        db.add_all(jobs)
+        await db.commit()
+        for job in jobs:
+            await db.refresh(job)
+    except Exception:
+        for _, path in saved:
+            if os.path.exists(path):
+                await asyncio.to_thread(os.remove, path)
+        raise
+    return [job_to_dict(job) for job in jobs]
 
-        # Remove from R2
-        delete_from_r2(doc.public_id)
+# ---------------- Ingestion job status ----------------
+async def get_ingestion_jobs(db: AsyncSession, current_user: User, job_id: int = None, limit: int = 50) -> List[dict]:
+    query = select(IngestionJob).where(IngestionJob.user_id == current_user.id)
+    if job_id is not None:
+        query = query.where(IngestionJob.id == job_id)
+    jobs = await db.scalars(query.order_by(IngestionJob.created_at.desc()).limit(limit))
+    return [job_to_dict(j) for j in jobs]
 
-        # Remove from chunks table
-        db.query(Chunk).filter(Chunk.document_id == doc.id).delete()
+# ---------------- Delete Document ----------------
+async def delete_document_r2(db: AsyncSession, current_user: User, doc_id: int, collection_manager) -> bool:
+    doc: Document = await db.scalar(
+        select(Document).where(Document.id == doc_id, Document.user_id == current_user.id)
+    )
+    if not doc:
+        raise ValueError("Document not found")
+    if not doc.public_id:
+        raise ValueError("Cannot delete: public_id is empty")
 
-        # Remove from documents table
-        db.delete(doc)
-        db.commit()
-        return True
+    # Remove from vector DB
+    await collection_manager.delete_by_file_name(doc.file_name)
 
-    return await asyncio.to_thread(sync_delete)
+    # Remove from R2
+    await asyncio.to_thread(delete_from_r2, doc.public_id)
 
-# ---------------- List User Documents ----------------
-async def get_user_documents(db: Session, current_user: User):
-    def fetch_docs():
-        docs = db.query(Document).filter(Document.user_id == current_user.id).all()
-        return [
-            {
-                "id": d.id,
-                "file_name": d.file_name,
-                "file_type": getattr(d, "file_type", "unknown"),
-                "url": getattr(d, "url", ""),
-                "public_id": getattr(d, "public_id", "")
-            }
-            for d in docs
-        ]
+    # Remove chunks, then the document (bulk deletes: no lazy loading of the chunks relationship)
+    await db.execute(delete(Chunk).where(Chunk.document_id == doc.id))
+    await db.execute(delete(Document).where(Document.id == doc.id))
+    await db.commit()
+    await invalidate_user_content_async(db, current_user.id, collection_manager.namespace)
+    return True
 
-    return await asyncio.to_thread(fetch_docs)
+# ---------------- List User Documents ----------------
+async def get_user_documents(db: AsyncSession, current_user: User):
+    docs = await db.scalars(select(Document).where(Document.user_id == current_user.id))
+    return [
+        {
+            "id": d.id,
+            "file_name": d.file_name,
+            "file_type": getattr(d, "file_type", "unknown"),
+            "url": getattr(d, "url", ""),
+            "public_id": getattr(d, "public_id", "")
+        }
+        for d in docs
+    ]
@@ -0,0 +1,435 @@
+import asyncio
+import time
+from typing import AsyncIterator, Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.db import AsyncSessionLocal
+from src.llm.ai_generator import get_llm_generator
+from src.models.chat_message import ChatSession
+from src.models.users import User
+from src.config import Config
+from src.services.bulk_writer import insert_chat_messages_async
+from src.services.content_version import get_content_version
+from src.services.embedding_service import embedding_service
+from src.services.semantic_cache import semantic_cache
+from src.vector_db.qdrant_manager import async_qdrant_manager
+from src.services.reranker import Reranker, select_reranker, rerank as rerank_context
+from src.utils.api_response import api_response
+from src.utils.sse import format_sse
+
+
+def results_to_context(results) -> List[Dict]:
+    """Flatten Qdrant scored points into the snippet dicts LLMGenerator expects."""
+    return [
+        {
+            "text": p.payload.get("text", ""),
+            "file_name": p.payload.get("file_name"),
+            "page_number": p.payload.get("page_number"),
+            "chunk_index": p.payload.get("chunk_index"),
+            "score": p.score
+        }
+        for p in results
+    ]
+
+
+def elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def source_summaries(context: List[Dict]) -> List[Dict]:
+    """Where an answer came from, as sent in the SSE `sources` event and kept with cached answers."""
+    return [{"file_name": c["file_name"], "page_number": c["page_number"], "score": c["score"]} for c in context]
+
+
+def _is_cacheable(answer: Dict, context: List[Dict]) -> bool:
+    """Only answers grounded in retrieved context, without errors or LLM failures, go into the semantic cache."""
+    return bool(context) and "error" not in answer and not answer.get("failed")
+
+
+def cache_variant(mode: str, limit: int, reranker: Optional[Reranker]) -> str:
+    """Semantic cache variant: answers built from differently ranked context are kept apart."""
+    return f"{mode}:{limit}:{reranker.name if reranker else 'plain'}"
+
+
+class RetrievalControllerAsync:
+    # ---------------- Retrieval ----------------
+    @staticmethod
+    async def embed_query(query: str) -> List[float]:
+        return (await embedding_service.embed_text_async([query]))[0]
+
+    @staticmethod
+    async def retrieve(
+        query: str,
+        collection_manager,
+        mode: str = "dense",
+        limit: int = 5,
+        query_vector: List[float] = None,
+        reranker: Optional[Reranker] = None,
+        timings: Dict = None
+    ) -> List[Dict]:
+        """
+        Embed the query (unless a vector is given) and return the top chunks as context dicts.
+        With a `reranker`, RERANK_CANDIDATES chunks are fetched and it keeps the best `limit`.
+        Per-stage durations (ms) are written into `timings` when given.
+        """
+        timings = timings if timings is not None else {}
+        if query_vector is None:
+            start = time.perf_counter()
+            query_vector = await RetrievalControllerAsync.embed_query(query)
+            timings["embed_ms"] = elapsed_ms(start)
+
+        fetch = max(limit, Config.RERANK_CANDIDATES) if reranker else limit
+
+        start = time.perf_counter()
+        results = await collection_manager.search(query_vector, limit=fetch, query_text=query, mode=mode)
+        context = results_to_context(results)
+        timings["search_ms"] = elapsed_ms(start)
+
+        if reranker:
+            start = time.perf_counter()
+            context = await rerank_context(query, context, top_k=limit, reranker=reranker)
+            timings["rerank_ms"] = elapsed_ms(start)
+        return context
+
+    # ---------------- Chat history ----------------
+    @staticmethod
+    async def save_exchange(db: AsyncSession, current_user: User, session_name: Optional[str], query: str, answer: Dict) -> int:
+        """Store the user query and the bot answer in the named chat session (created if missing)."""
+        session = None
+        if session_name:
+            session = await db.scalar(select(ChatSession).where(
+                ChatSession.user_id == current_user.id,
+                ChatSession.session_name == session_name
+            ))
+        if not session:
+            session = ChatSession(user_id=current_user.id, session_name=session_name or query[:50])
+            db.add(session)
+            await db.flush()
+
+        await insert_chat_messages_async(db, [
+            {"session_id": session.id, "role": "user", "content": query},
+            {
+                "session_id": session.id,
+                "role": "bot",
+                "content": answer.get("text") or "",
+                "file_name": answer.get("file_name"),
+                "page_number": answer.get("page_number"),
+                "score": answer.get("score"),
+            },
+        ])
+        await db.commit()
+        return session.id
+
+    # ---------------- Search + Answer ----------------
+    @staticmethod
+    async def search_documents_ai(
+        query: str,
+        session_name: Optional[str],
+        current_user: User,
+        collection_manager,
+        db: AsyncSession,
+        mode: str = "dense",
+        limit: int = 5,
+        rerank: Optional[bool] = None
+    ):
+        if not query or not query.strip():
+            return api_response.error(message="Query cannot be empty", status_code=400)
+
+        reranker = await select_reranker(rerank)
+        timings = {}
+        start = time.perf_counter()
+        query_vector = await RetrievalControllerAsync.embed_query(query)
+        timings["embed_ms"] = elapsed_ms(start)
+        collection_name = collection_manager.namespace
+        variant = cache_variant(mode, limit, reranker)
+
+        answer = None
+        if Config.SEMANTIC_CACHE_ENABLED:
+            # Read before retrieval: an upload finishing mid-request must not be masked by this answer
+            version = await get_content_version(current_user.id)
+            answer = semantic_cache.lookup(collection_name, query_vector, variant=variant, version=version)
+        cached = answer is not None
+
+        if not cached:
+            context = await RetrievalControllerAsync.retrieve(
+                query, collection_manager, mode=mode, limit=limit, query_vector=query_vector,
+                reranker=reranker, timings=timings
+            )
+            start = time.perf_counter()
+            answer = await get_llm_generator().generate_async(context, query)
+            timings["generate_ms"] = elapsed_ms(start)
+            if "error" in answer:
+                return api_response.error(message=answer["error"], status_code=answer.get("status_code", 400))
+            if Config.SEMANTIC_CACHE_ENABLED and _is_cacheable(answer, context):
+                semantic_cache.store(
+                    collection_name, query_vector, answer, variant=variant, version=version,
+                    sources=source_summaries(context)
+                )
+
+        session_id = await RetrievalControllerAsync.save_exchange(db, current_user, session_name, query, answer)
+
+        return api_response.success(
+            data=[answer],
+            message="Search completed successfully",
+            extra={"session_id": session_id, "cached": cached, "timings": timings}
+        )
+
+    # ---------------- Retrieval only ----------------
+    @staticmethod
+    async def retrieve_chunks(
+        query: str,
+        collection_manager,
+        file_names: Optional[List[str]] = None,
+        file_types: Optional[List[str]] = None,
+        page_from: Optional[int] = None,
+        page_to: Optional[int] = None,
+        score_threshold: Optional[float] = None,
+        mode: str = "dense",
+        limit: int = 10,
+        offset: int = 0
+    ):
+        """Ranked chunks for a query, filtered and paginated, without LLM generation."""
+        if not query or not query.strip():
+            return api_response.error(message="Query cannot be empty", status_code=400)
+        if page_from is not None and page_to is not None and page_from > page_to:
+            return api_response.error(message="page_from must not exceed page_to", status_code=400)
+
+        timings = {}
+        start = time.perf_counter()
+        query_vector = await RetrievalControllerAsync.embed_query(query)
+        timings["embed_ms"] = elapsed_ms(start)
+
+        start = time.perf_counter()
+        points, has_more = await collection_manager.retrieve(
+            query_vector,
+            limit=limit,
+            offset=offset,
+            query_filter=collection_manager.build_filter(file_names, file_types, page_from, page_to),
+            score_threshold=score_threshold,
+            query_text=query,
+            mode=mode
+        )
+        timings["search_ms"] = elapsed_ms(start)
+
+        return api_response.success(
+            data=[{**c, "file_type": p.payload.get("file_type")} for c, p in zip(results_to_context(points), points)],
+            message="Chunks retrieved successfully",
+            extra={
+                "pagination": {
+                    "offset": offset,
+                    "limit": limit,
+                    "next_offset": offset + limit if has_more else None
+                },
+                "timings": timings
+            }
+        )
+
+    # ---------------- Cross-collection Search (admin) ----------------
+    @staticmethod
+    async def search_across_collections(
+        query: str,
+        db: AsyncSession,
+        usernames: Optional[List[str]] = None,
+        mode: str = "dense",
+        limit: int = 10
+    ):
+        """Fan a query out to many users' collections and return the merged top `limit` chunks."""
+        if not query or not query.strip():
+            return api_response.error(message="Query cannot be empty", status_code=400)
+
+        shared = Config.QDRANT_STORAGE_LAYOUT == "shared"
+
+        q = select(User.id, User.username, User.collection)
+        if usernames:
+            q = q.where(User.username.in_(usernames))
+        # Keyed by where the user's points live: tenant id (shared) or collection name
+        owners = {
+            str(user_id) if shared else collection: username
+            for user_id, username, collection in (await db.execute(q)).all()
+        }
+
+        timings = {}
+        start = time.perf_counter()
+        query_vector = await RetrievalControllerAsync.embed_query(query)
+        timings["embed_ms"] = elapsed_ms(start)
+
+        start = time.perf_counter()
+        if shared:
+            # One filtered query over the shared collection replaces the fan-out
+            points = await async_qdrant_manager.search_tenants(
+                list(owners) if usernames else None, query_vector, limit=limit, query_text=query, mode=mode
+            )
+            hits = [(p.payload.get("user_id"), p) for p in points]
+            report = {"searched": 1, "timed_out": [], "failed": []}
+        else:
+            hits, report = await async_qdrant_manager.search_many(
+                list(owners), query_vector, limit=limit, query_text=query, mode=mode
+            )
+        timings["search_ms"] = elapsed_ms(start)
+
+        data = []
+        for (collection_name, point), context in zip(hits, results_to_context([p for _, p in hits])):
+            data.append({**context, "collection": collection_name, "username": owners.get(collection_name)})
+
+        return api_response.success(
+            data=data,
+            message="Cross-collection search completed successfully",
+            extra={"report": report, "timings": timings}
+        )
+
+    # ---------------- Batch Search ----------------
+    @staticmethod
+    async def batch_search_documents(
+        queries: List[str],
+        current_user: User,
+        collection_manager,
+        mode: str = "dense",
+        limit: int = 5,
+        rerank: Optional[bool] = None,
+        generate: bool = False
+    ):
+        """
+        Answer many questions against one collection: a single embedding call,
+        a single Qdrant batch query, then optional concurrent re-ranking and
+        answer generation. Results are not stored in chat history.
+        """
+        queries = [q.strip() for q in queries]
+        if not all(queries):
+            return api_response.error(message="Queries cannot be empty", status_code=400)
+
+        reranker = await select_reranker(rerank)
+        fetch = max(limit, Config.RERANK_CANDIDATES) if reranker else limit
+        timings = {}
+        use_cache = generate and Config.SEMANTIC_CACHE_ENABLED
+        version = await get_content_version(current_user.id) if use_cache else 0
+
+        start = time.perf_counter()
+        query_vectors = await embedding_service.embed_text_async(queries)
+        timings["embed_ms"] = elapsed_ms(start)
+
+        start = time.perf_counter()
+        results = await collection_manager.search_batch(query_vectors, limit=fetch, query_texts=queries, mode=mode)
+        contexts = [results_to_context(r) for r in results]
+        timings["search_ms"] = elapsed_ms(start)
+
+        if reranker:
+            start = time.perf_counter()
+            contexts = await asyncio.gather(*[
+                rerank_context(q, c, top_k=limit, reranker=reranker) for q, c in zip(queries, contexts)
+            ])
+            timings["rerank_ms"] = elapsed_ms(start)
+
+        answers = [None] * len(queries)
+        if generate:
+            collection_name = collection_manager.namespace
+            variant = cache_variant(mode, limit, reranker)
+
+            async def answer(i: int):
+                vector = query_vectors[i]
+                if use_cache:
+                    cached = semantic_cache.lookup(collection_name, vector, variant=variant, version=version)
+                    if cached is not None:
+                        return cached
+                result = await get_llm_generator().generate_async(contexts[i], queries[i])
+                if use_cache and _is_cacheable(result, contexts[i]):
+                    semantic_cache.store(
+                        collection_name, vector, result, variant=variant, version=version,
+                        sources=source_summaries(contexts[i])
+                    )
+                return result
+
+            start = time.perf_counter()
+            answers = await asyncio.gather(*[answer(i) for i in range(len(queries))])
+            timings["generate_ms"] = elapsed_ms(start)
+
+        return api_response.success(
+            data=[
+                {"query": q, "answer": a, "sources": c}
+                for q, a, c in zip(queries, answers, contexts)
+            ],
+            message="Batch search completed successfully",
+            extra={"timings": timings}
+        )
+
+    # ---------------- Search + Streamed Answer (SSE) ----------------
+    @staticmethod
+    async def stream_search_documents_ai(
+        query: str,
+        session_name: Optional[str],
+        current_user: User,
+        collection_manager,
+        mode: str = "dense",
+        limit: int = 5,
+        rerank: Optional[bool] = None
+    ) -> AsyncIterator[str]:
+        """
+        Server-Sent Events for one search: a `sources` event with the retrieved
+        chunks, `token` events as the answer is generated, then `done` once the
+        exchange has been stored in the chat session. The 200 response is already
+        sent by the time anything can fail, so failures end the stream with an
+        `error` event instead of dropping the connection.
+        """
+        try:
+            async for event in RetrievalControllerAsync._stream_events(
+                query, session_name, current_user, collection_manager, mode, limit, rerank
+            ):
+                yield event
+        except Exception as e:
+            print(f"❌ Search stream failed: {e}")
+            yield format_sse("error", {"message": str(e) or "Search failed"})
+
+    @staticmethod
+    async def _stream_events(
+        query: str,
+        session_name: Optional[str],
+        current_user: User,
+        collection_manager,
+        mode: str,
+        limit: int,
+        rerank: Optional[bool]
+    ) -> AsyncIterator[str]:
+        if not query or not query.strip():
+            yield format_sse("error", {"message": "Query cannot be empty"})
+            return
+
+        reranker = await select_reranker(rerank)
+        query_vector = await RetrievalControllerAsync.embed_query(query)
+        collection_name = collection_manager.namespace
+        variant = cache_variant(mode, limit, reranker)
+
+        entry = None
+        if Config.SEMANTIC_CACHE_ENABLED:
+            version = await get_content_version(current_user.id)
+            entry = semantic_cache.lookup_entry(collection_name, query_vector, variant=variant, version=version)
+        cached = entry is not None
+
+        if cached:
+            answer, sources = entry
+            yield format_sse("sources", sources or [])
+            yield format_sse("token", {"text": answer.get("text", "")})
+        else:
+            context = await RetrievalControllerAsync.retrieve(
+                query, collection_manager, mode=mode, limit=limit, query_vector=query_vector, reranker=reranker
+            )
+            sources = source_summaries(context)
+            yield format_sse("sources", sources)
+
+            async for event in get_llm_generator().generate_stream(context, query):
+                if event["type"] == "token":
+                    yield format_sse("token", {"text": event["text"]})
+                else:
+                    answer = event["answer"]
+
+            if "error" in answer:
+                yield format_sse("error", {"message": answer["error"]})
+                return
+            if Config.SEMANTIC_CACHE_ENABLED and _is_cacheable(answer, context):
+                semantic_cache.store(
+                    collection_name, query_vector, answer, variant=variant, version=version, sources=sources
+                )
+
+        # The request-scoped session may already be closed once the body streams
+        async with AsyncSessionLocal() as db:
+            session_id = await RetrievalControllerAsync.save_exchange(db, current_user, session_name, query, answer)
+
+        yield format_sse("done", {"answer": answer, "session_id": session_id, "cached": cached})
@@ -1,13 +1,56 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from src.config import Config
 
 DATABASE_URL = Config.POSTGRES_URI
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+def _pool_options(url) -> dict:
+    if url.get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": Config.DB_POOL_SIZE,
+        "max_overflow": Config.DB_MAX_OVERFLOW,
+        "pool_timeout": Config.DB_POOL_TIMEOUT,
+        "pool_recycle": Config.DB_POOL_RECYCLE,
+    }
+
+def _async_engine_args(database_url: str):
+    """
+    asyncpg URL and connect args for POSTGRES_URI.
+    libpq-only query options (sslmode, channel_binding) are translated or dropped,
+    since asyncpg rejects them.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "postgresql":
+        return url, {}
+
+    query = dict(url.query)
+    sslmode = query.pop("sslmode", None)
+    query.pop("channel_binding", None)
+    query["prepared_statement_cache_size"] = str(Config.DB_STATEMENT_CACHE_SIZE)
+    url = url.set(drivername="postgresql+asyncpg", query=query)
+
+    connect_args = {"statement_cache_size": Config.DB_STATEMENT_CACHE_SIZE}
+    if sslmode and sslmode not in ("disable", "allow", "prefer"):
+        connect_args["ssl"] = "require" if sslmode == "require" else True
+    return url, connect_args
+
+engine = create_engine(DATABASE_URL, pool_pre_ping=True, **_pool_options(make_url(DATABASE_URL)))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+_async_url, _async_connect_args = _async_engine_args(DATABASE_URL)
+async_engine = create_async_engine(
+    _async_url,
+    pool_pre_ping=True,
+    connect_args=_async_connect_args,
+    **_pool_options(_async_url)
+)
+# expire_on_commit=False: ORM objects stay readable after commit without lazy IO
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
 # Dependency
 def get_db():
     db = SessionLocal()
@@ -15,3 +58,24 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def pool_stats() -> dict:
+    """Connection pool usage for both engines (exposed on /health/metrics)."""
+    def describe(pool):
+        if not hasattr(pool, "checkedout"):
+            return {"status": pool.status()}
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
+
+    return {
+        "sync": describe(engine.pool),
+        "async": describe(async_engine.sync_engine.pool),
+    }
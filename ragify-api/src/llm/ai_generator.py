@@ -2,8 +2,12 @@ from langchain_core.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
-from typing import List, Dict
+from typing import List, Dict, AsyncIterator
 import asyncio
+import httpx
+from contextlib import asynccontextmanager
+from src.config import Config
+from src.llm.context_builder import ContextBuilder
 
 class DocumentAnswer(BaseModel):
     text: str
@@ -11,9 +15,39 @@ class DocumentAnswer(BaseModel):
     page_number: int = None
     score: float = 0.0
 
+def failed_answer(reason: str) -> dict:
+    """Answer returned when the LLM call fails; `failed` keeps it out of the semantic cache."""
+    return {"text": f"LLM generation failed: {reason}", "file_name": None, "page_number": None, "score": 0.0, "failed": True}
+
 class LLMGenerator:
-    def __init__(self, model_name: str = "gpt-3.5-turbo", temperature: float = 0.0):
-        self.model = ChatOpenAI(model_name=model_name, temperature=temperature)
+    def __init__(
+        self,
+        model_name: str = "gpt-3.5-turbo",
+        temperature: float = 0.0,
+        timeout: float = Config.LLM_TIMEOUT,
+        max_concurrency: int = Config.LLM_MAX_CONCURRENCY
+    ):
+        self.timeout = timeout
+        # One keep-alive pool shared by every async generation in this worker
+        self.http_async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=Config.LLM_POOL_SIZE,
+                max_keepalive_connections=Config.LLM_POOL_SIZE
+            )
+        )
+        self.model = ChatOpenAI(
+            model_name=model_name,
+            temperature=temperature,
+            timeout=timeout,
+            max_retries=Config.LLM_MAX_RETRIES,
+            http_async_client=self.http_async_client
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.waiting = 0
+        self.timeouts = 0
         self.parser = JsonOutputParser(pydantic_object=DocumentAnswer)
         self.prompt_template = PromptTemplate(
             template=(
@@ -27,6 +61,7 @@ class LLMGenerator:
             partial_variables={"format_instructions": self.parser.get_format_instructions()}
         )
         self.chain = self.prompt_template | self.model | self.parser
+        self.context_builder = ContextBuilder(model=model_name)
 
     def generate(self, context: List[Dict], query: str) -> dict:
         if not query.strip():
@@ -34,14 +69,114 @@ class LLMGenerator:
         if not context:
             return {"text": "", "file_name": None, "page_number": None, "score": 0.0}
 
-        snippets = "\n\n".join(
-            [f"{d['text']} (File: {d['file_name']}, Page: {d['page_number']}, Score: {d['score']})" for d in context]
-        )
+        snippets = self._format_snippets(self.context_builder.build(context))
 
         try:
             return self.chain.invoke({"query": query, "snippets": snippets})
         except Exception as e:
-            return {"text": f"LLM generation failed: {str(e)}", "file_name": None, "page_number": None, "score": 0.0}
+            return failed_answer(str(e))
 
     async def generate_async(self, context: List[Dict], query: str) -> dict:
-        return await asyncio.to_thread(self.generate, context, query)
+        """Same as generate() on the chain's native async path; holds no thread while waiting on OpenAI."""
+        if not query.strip():
+            return {"error": "Invalid input query", "status_code": 400}
+        if not context:
+            return {"text": "", "file_name": None, "page_number": None, "score": 0.0}
+
+        snippets = self._format_snippets(self.context_builder.build(context))
+
+        async with self._slot():
+            try:
+                # Overall deadline: the HTTP timeout applies per attempt, retries included here
+                async with asyncio.timeout(self.timeout * (Config.LLM_MAX_RETRIES + 1)):
+                    return await self.chain.ainvoke({"query": query, "snippets": snippets})
+            except TimeoutError:
+                self.timeouts += 1
+                return failed_answer("timed out")
+            except Exception as e:
+                return failed_answer(str(e))
+
+    async def generate_stream(self, context: List[Dict], query: str) -> AsyncIterator[dict]:
+        """
+        Stream the answer as it is generated.
+        Yields {"type": "token", "text": delta} events for the answer text as the
+        JSON parser sees it grow, then one {"type": "answer", "answer": dict} event
+        with the complete parsed answer.
+        """
+        if not query.strip():
+            yield {"type": "answer", "answer": {"error": "Invalid input query", "status_code": 400}}
+            return
+        if not context:
+            yield {"type": "answer", "answer": {"text": "", "file_name": None, "page_number": None, "score": 0.0}}
+            return
+
+        snippets = self._format_snippets(self.context_builder.build(context))
+        answer: dict = {}
+        streamed = ""
+        async with self._slot():
+            try:
+                # JsonOutputParser streams progressively more complete dicts
+                async for partial in self.chain.astream({"query": query, "snippets": snippets}):
+                    if not isinstance(partial, dict):
+                        continue
+                    answer = partial
+                    text = partial.get("text") or ""
+                    if len(text) > len(streamed) and text.startswith(streamed):
+                        yield {"type": "token", "text": text[len(streamed):]}
+                        streamed = text
+            except Exception as e:
+                answer = failed_answer(str(e))
+
+        yield {"type": "answer", "answer": answer}
+
+    @asynccontextmanager
+    async def _slot(self):
+        """Cap concurrent generations at max_concurrency; extra requests queue here."""
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "timeouts": self.timeouts,
+        }
+
+    async def aclose(self):
+        await self.http_async_client.aclose()
+
+    @staticmethod
+    def _format_snippets(context: List[Dict]) -> str:
+        return "\n\n".join(
+            [f"{d['text']} (File: {d['file_name']}, Page: {d['page_number']}, Score: {round(d['score'], 4)})" for d in context]
+        )
+
+_llm_generator = None
+
+def get_llm_generator() -> LLMGenerator:
+    """Shared generator, built on first use so importing never requires OpenAI credentials."""
+    global _llm_generator
+    if _llm_generator is None:
+        _llm_generator = LLMGenerator(model_name=Config.OPENAI_CHAT_MODEL or "gpt-3.5-turbo")
+    return _llm_generator
+
+def llm_generator_stats() -> dict:
+    """Concurrency counters, or None if no generation has run in this worker yet."""
+    return _llm_generator.stats() if _llm_generator is not None else None
+
+async def close_llm_generator():
+    """Release the generator's HTTP pool (called on app shutdown)."""
+    global _llm_generator
+    if _llm_generator is not None:
+        await _llm_generator.aclose()
+        _llm_generator = None
@@ -0,0 +1,106 @@
+from typing import Dict, List, Optional
+from src.config import Config
+from src.utils.tokens import count_tokens
+
+
+class ContextBuilder:
+    """
+    Packs retrieved chunks into the prompt under a token budget.
+
+    - exact and contained duplicates are dropped
+    - chunks from the same file and page that are adjacent (consecutive
+      chunk_index, or sharing the splitter's overlap) are merged, with the
+      overlapping text kept once
+    - merged blocks are added best score first until the budget is spent
+    """
+
+    def __init__(
+        self,
+        token_budget: int = Config.LLM_CONTEXT_TOKEN_BUDGET,
+        model: str = "",
+        max_overlap: int = 100,
+        min_overlap: int = 10
+    ):
+        self.token_budget = token_budget
+        self.model = model
+        self.max_overlap = max_overlap
+        self.min_overlap = min_overlap
+
+    # ---------------- Overlap ----------------
+    def _overlap(self, left: str, right: str) -> int:
+        """Length of the longest suffix of `left` that is a prefix of `right`."""
+        longest = min(len(left), len(right), self.max_overlap)
+        for size in range(longest, self.min_overlap - 1, -1):
+            if left.endswith(right[:size]):
+                return size
+        return 0
+
+    def _dedupe(self, chunks: List[Dict]) -> List[Dict]:
+        """Drop chunks whose text repeats, or is contained in, a higher-scored chunk."""
+        kept: List[Dict] = []
+        for chunk in sorted(chunks, key=lambda c: c.get("score") or 0.0, reverse=True):
+            text = chunk.get("text", "").strip()
+            if not text or any(text in k["text"] for k in kept):
+                continue
+            kept.append({**chunk, "text": text})
+        return kept
+
+    # ---------------- Merge ----------------
+    def _merge_adjacent(self, chunks: List[Dict]) -> List[Dict]:
+        groups: Dict[tuple, List[Dict]] = {}
+        for chunk in chunks:
+            groups.setdefault((chunk.get("file_name"), chunk.get("page_number")), []).append(chunk)
+
+        merged: List[Dict] = []
+        for group in groups.values():
+            if all(c.get("chunk_index") is not None for c in group):
+                group.sort(key=lambda c: c["chunk_index"])
+            current: Optional[Dict] = None
+            for chunk in group:
+                if current is None:
+                    current = dict(chunk)
+                    continue
+                overlap = self._overlap(current["text"], chunk["text"])
+                consecutive = (
+                    chunk.get("chunk_index") is not None
+                    and current.get("chunk_index") is not None
+                    and chunk["chunk_index"] == current["chunk_index"] + 1
+                )
+                # Without chunk_index the group is in score order, so the overlap may run backwards
+                reverse_overlap = 0 if overlap or consecutive else self._overlap(chunk["text"], current["text"])
+                if overlap or consecutive:
+                    current["text"] = current["text"] + ("" if overlap else " ") + chunk["text"][overlap:]
+                    current["chunk_index"] = chunk.get("chunk_index")
+                    current["score"] = max(current.get("score") or 0.0, chunk.get("score") or 0.0)
+                elif reverse_overlap:
+                    current["text"] = chunk["text"] + current["text"][reverse_overlap:]
+                    current["score"] = max(current.get("score") or 0.0, chunk.get("score") or 0.0)
+                else:
+                    merged.append(current)
+                    current = dict(chunk)
+            if current is not None:
+                merged.append(current)
+        return merged
+
+    # ---------------- Build ----------------
+    def build(self, context: List[Dict]) -> List[Dict]:
+        """Return the blocks to send, best score first, within token_budget."""
+        blocks = self._merge_adjacent(self._dedupe(context))
+        blocks.sort(key=lambda b: b.get("score") or 0.0, reverse=True)
+
+        packed: List[Dict] = []
+        used = 0
+        for block in blocks:
+            tokens = count_tokens(block["text"], self.model)
+            if used + tokens > self.token_budget:
+                # Smaller, lower-ranked blocks may still fit
+                continue
+            packed.append(block)
+            used += tokens
+
+        if not packed and blocks:
+            # Never send an empty context: keep the head of the best block
+            best = dict(blocks[0])
+            best["text"] = best["text"][: self.token_budget * 4]
+            packed.append(best)
+        return packed
@@ -1,4 +1,5 @@
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
@@ -6,10 +7,32 @@ from fastapi.exceptions import RequestValidationError
 from src.utils.api_response import api_response
 from src.utils.error_handler import error_handler
 from src.config import Config
+from src.vector_db.qdrant_manager import async_qdrant_manager
+from src.llm.ai_generator import close_llm_generator
+from src.services.ingestion_queue import ingestion_worker_pool
+from src.db import async_engine
+from src.auth.password_hasher import password_hasher
+from src.services.reranker import load_reranker
 
 # Import routers
-from src.routers import auth_router, health_check_router, user_router, document_router, search_router, chat_router, analytics_router
-app = FastAPI(title="RAGify API")
+from src.routers import auth_router, health_check_router, user_router, document_router, search_router, chat_router, analytics_router, admin_search_router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the pooled async Qdrant client once per worker
+    await async_qdrant_manager.connect()
+    # Load the re-ranker (cross-encoder weights) before serving, off the event loop
+    await load_reranker()
+    if Config.INGEST_RUN_IN_API:
+        ingestion_worker_pool.start()
+    yield
+    await ingestion_worker_pool.stop()
+    await async_qdrant_manager.close()
+    await close_llm_generator()
+    await async_engine.dispose()
+    password_hasher.shutdown()
+
+app = FastAPI(title="RAGify API", lifespan=lifespan)
 
 # --- CORS Middleware ---
 origins = [
@@ -39,6 +62,7 @@ app.include_router(document_router.router, prefix=API_PREFIX)
 app.include_router(search_router.router, prefix=API_PREFIX)
 app.include_router(chat_router.router, prefix=API_PREFIX)
 app.include_router(analytics_router.router, prefix=API_PREFIX)
+app.include_router(admin_search_router.router, prefix=API_PREFIX)
 
 
 @app.get(f"{API_PREFIX}/ping")
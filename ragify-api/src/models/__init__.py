@@ -2,5 +2,6 @@ from .users import User, RoleEnum
 from .documents import Document
 from .chunks import Chunk 
 from .chat_message import ChatSession, ChatMessage
+from .ingestion_jobs import IngestionJob
 
-__all__ = ["User", "RoleEnum", "Document", "Chunk", "ChatSession", "ChatMessage"]
+__all__ = ["User", "RoleEnum", "Document", "Chunk", "ChatSession", "ChatMessage", "IngestionJob"]
@@ -1,16 +1,22 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, Index
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from sqlalchemy.orm import relationship, deferred
 from src.db import Base
+from src.models.vector_types import embedding_column_type
+
+EMBEDDING_TYPE = embedding_column_type()
 
 class Chunk(Base):
     __tablename__ = "chunks"
 
     id = Column(Integer, primary_key=True, index=True)
     text = Column(String, nullable=False)
-    embedding = Column(ARRAY(Float), nullable=False)
+    if EMBEDDING_TYPE is not None:
+        # Deferred: vectors are served from Qdrant, so ordinary chunk loads skip them
+        embedding = deferred(Column(EMBEDDING_TYPE, nullable=True))
     page_number = Column(Integer, nullable=True, index=True)
     file_name = Column(String, nullable=False, index=True)
+    chunk_index = Column(Integer, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # sha256 of the chunk text, for incremental re-ingest
 
     document_id = Column(
         Integer, 
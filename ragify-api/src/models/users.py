@@ -18,6 +18,9 @@ class User(Base):
     # Indexed + unique
     collection = Column(String, unique=True, index=True, nullable=False)
 
+    # Bumped whenever the user's documents change; part of the semantic cache key
+    content_version = Column(Integer, nullable=False, default=0, server_default="0")
+
     documents = relationship("Document", back_populates="user")
 
 
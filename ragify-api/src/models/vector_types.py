@@ -0,0 +1,53 @@
+from typing import Optional
+import numpy as np
+from sqlalchemy import Float, LargeBinary
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.types import TypeDecorator
+from src.config import Config
+
+EMBEDDING_STORAGE_MODES = ("none", "float32", "pgvector", "array")
+
+# Little-endian float32, so stored bytes do not depend on the host
+FLOAT32 = np.dtype("<f4")
+
+
+def to_float32_bytes(vector) -> bytes:
+    return np.asarray(vector, dtype=FLOAT32).tobytes()
+
+
+class Float32Vector(TypeDecorator):
+    """
+    Embedding stored as packed float32 in a bytea column: 4 bytes per
+    dimension instead of 8 (+ array header) for DOUBLE PRECISION[].
+    Reads decode with np.frombuffer, a zero-copy read-only view of the row bytes.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect) -> Optional[bytes]:
+        if value is None or isinstance(value, (bytes, bytearray, memoryview)):
+            return value
+        return to_float32_bytes(value)
+
+    def process_result_value(self, value, dialect) -> Optional[np.ndarray]:
+        if value is None:
+            return None
+        return np.frombuffer(value, dtype=FLOAT32)
+
+
+def embedding_column_type(mode: str = Config.CHUNK_EMBEDDING_STORAGE, dimension: int = Config.EMBEDDING_DIMENSION):
+    """Column type for Chunk.embedding, or None when embeddings are not stored in Postgres."""
+    if mode == "none":
+        return None
+    if mode == "float32":
+        return Float32Vector()
+    if mode == "pgvector":
+        try:
+            from pgvector.sqlalchemy import Vector
+        except ImportError as e:
+            raise ImportError("CHUNK_EMBEDDING_STORAGE=pgvector requires the 'pgvector' package") from e
+        return Vector(dimension)
+    if mode == "array":
+        return ARRAY(Float)
+    raise ValueError(f"Unknown chunk embedding storage: {mode}. Expected one of {list(EMBEDDING_STORAGE_MODES)}")
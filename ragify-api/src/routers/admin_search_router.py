@@ -0,0 +1,33 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, Body, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.db import get_async_db
+from src.models.users import User
+from src.auth.dependencies import get_current_admin
+from src.controllers.retrieval_controller import RetrievalControllerAsync
+from src.schemas.search_query import CrossCollectionQuery
+
+router = APIRouter(
+    prefix="/admin/search",
+    tags=["Admin Search"],
+)
+
+@router.post("/")
+async def search_all_collections(
+    body: CrossCollectionQuery = Body(...),
+    mode: Literal["dense", "hybrid"] = Query("dense", description="dense, or dense + BM25 fused with RRF"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    admin: User = Depends(get_current_admin)
+):
+    """
+    Search every user's collection (or the listed users') at once.
+    Collections slower than QDRANT_FANOUT_DEADLINE are skipped and listed in the report.
+    """
+    return await RetrievalControllerAsync.search_across_collections(
+        query=body.query,
+        db=db,
+        usernames=body.usernames,
+        mode=mode,
+        limit=limit
+    )
@@ -1,23 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from src.db import get_db
-from src.models.users import User, RoleEnum
+from src.models.users import User
 from src.controllers.admin_analytics_controller import AdminAnalyticsControllerAsync
-from src.auth.dependencies import get_current_user  
+from src.auth.dependencies import get_current_admin
 
 router = APIRouter(
     prefix="/admin/analytics",
     tags=["Admin Analytics"],
 )
 
-def get_current_admin(user: User = Depends(get_current_user)):
-    if user.role != RoleEnum.admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You are not authorized to access this resource",
-        )
-    return user
-
 @router.get("/")
 async def admin_dashboard(db: Session = Depends(get_db), admin: User = Depends(get_current_admin)):
     """
@@ -1,19 +1,30 @@
 from fastapi import APIRouter, Depends, Response
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.schemas.users import RegisterSchema, LoginSchema
-from src.db import get_db
+from src.db import get_async_db
 from src.controllers.auth_controller import register_user, authenticate_user
+from src.auth.password_hasher import PasswordHasherBusy
 from src.utils.api_response import api_response
 from src.models.users import RoleEnum, User
+from sqlalchemy import select
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from src.auth.jwt import decode_access_token
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
+def busy_response():
+    """Shed load while the password hashing pool is saturated."""
+    response = api_response.error(message="Too many login attempts in progress, please retry shortly", status_code=503)
+    response.headers["Retry-After"] = "1"
+    return response
+
 # --- Register Route ---
 @router.post("/register")
-async def register(data: RegisterSchema, db: Session = Depends(get_db)):
-    user = await register_user(db, data.username, data.password, data.role)
+async def register(data: RegisterSchema, db: AsyncSession = Depends(get_async_db)):
+    try:
+        user = await register_user(db, data.username, data.password, data.role)
+    except PasswordHasherBusy:
+        return busy_response()
     if not user:
         return api_response.error(message="Username already exists", status_code=400)
     
@@ -24,8 +35,11 @@ async def register(data: RegisterSchema, db: Session = Depends(get_db)):
 
 # --- Login Route ---
 @router.post("/login")
-async def login(data: LoginSchema, db: Session = Depends(get_db)):
-    result = await authenticate_user(db, data.username, data.password)
+async def login(data: LoginSchema, db: AsyncSession = Depends(get_async_db)):
+    try:
+        result = await authenticate_user(db, data.username, data.password)
+    except PasswordHasherBusy:
+        return busy_response()
     if not result:
         return api_response.error(message="Invalid credentials", status_code=401)
 
@@ -43,17 +57,14 @@ security = HTTPBearer()
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     token = credentials.credentials
     payload = decode_access_token(token)
     if not payload or "sub" not in payload:
         return api_response.error(message="Invalid token", status_code=401)
     
-    def get_user_sync():
-        return db.query(User).filter(User.username == payload["sub"]).first()
-    
-    user = await asyncio.to_thread(get_user_sync)
+    user = await db.scalar(select(User).where(User.username == payload["sub"]))
     if not user:
         return api_response.error(message="User not found", status_code=401)
     
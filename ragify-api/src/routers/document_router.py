@@ -1,44 +1,65 @@
-from fastapi import APIRouter, UploadFile, Depends
-from sqlalchemy.orm import Session
+from typing import List
+from fastapi import APIRouter, UploadFile, File, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.auth.dependencies import get_current_user
-from src.db import get_db
+from src.config import Config
+from src.db import get_async_db
 from src.models.users import User
-from src.vector_db.dependencies import get_user_qdrant_manager
+from src.vector_db.dependencies import get_user_async_qdrant_manager
 from src.utils.api_response import api_response
-from src.utils.file_utils import save_upload_to_disk
-from src.controllers.document_controller import process_document_upload, delete_document_r2, get_user_documents
-import asyncio
+from src.controllers.document_controller import (
+    enqueue_document_uploads, get_ingestion_jobs, delete_document_r2, get_user_documents
+)
 
 router = APIRouter(prefix="/documents", tags=["Documents"])
 
 @router.post("/upload/")
 async def upload_document(
     file: UploadFile,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    collection_manager = Depends(get_user_qdrant_manager)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
 ):
-    file_path = await save_upload_to_disk(file)
+    # Queued for the ingestion workers; poll /documents/jobs/{id} for progress
+    jobs = await enqueue_document_uploads([file], db=db, current_user=current_user)
+    return api_response.success(data=jobs[0], message="Upload started, processing in background.")
 
-    # Fire and forget
-    asyncio.create_task(
-        process_document_upload(
-            file=file,
-            file_path=file_path,
-            db=db,
-            current_user=current_user,
-            collection_manager=collection_manager
-        )
-    )
+@router.post("/upload/batch")
+async def upload_documents(
+    files: List[UploadFile] = File(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    if len(files) > Config.INGEST_MAX_FILES:
+        return api_response.error(message=f"At most {Config.INGEST_MAX_FILES} files per upload", status_code=400)
+    jobs = await enqueue_document_uploads(files, db=db, current_user=current_user)
+    return api_response.success(data=jobs, message=f"{len(jobs)} upload(s) queued for processing.")
 
-    return api_response.success(message="Upload started, processing in background.")
+@router.get("/jobs/")
+async def list_ingestion_jobs(
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    jobs = await get_ingestion_jobs(db=db, current_user=current_user, limit=limit)
+    return api_response.success(data=jobs, message=f"{len(jobs)} job(s) found")
+
+@router.get("/jobs/{job_id}")
+async def get_ingestion_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    jobs = await get_ingestion_jobs(db=db, current_user=current_user, job_id=job_id)
+    if not jobs:
+        return api_response.error(message="Job not found", status_code=404)
+    return api_response.success(data=jobs[0], message="Job fetched successfully")
 
 @router.delete("/{doc_id}")
 async def delete_document(
     doc_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
-    collection_manager = Depends(get_user_qdrant_manager)
+    collection_manager = Depends(get_user_async_qdrant_manager)
 ):
     try:
         await delete_document_r2(db=db, current_user=current_user, doc_id=doc_id, collection_manager=collection_manager)
@@ -47,7 +68,7 @@ async def delete_document(
         return api_response.error(message=str(e), status_code=404)
 
 @router.get("/")
-async def list_documents(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def list_documents(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     try:
         docs = await get_user_documents(db=db, current_user=current_user)
         return api_response.success(data=docs, message=f"{len(docs)} document(s) found")
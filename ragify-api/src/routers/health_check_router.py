@@ -1,5 +1,13 @@
 from fastapi import APIRouter
 from src.utils.api_response import api_response
+from src.auth.password_hasher import password_hasher
+from src.auth.user_cache import user_cache
+from src.db import pool_stats
+from src.services.embedding_service import embedding_service
+from src.llm.ai_generator import llm_generator_stats
+from src.services.semantic_cache import semantic_cache
+from src.services.ingestion_queue import ingestion_worker_pool
+from src.vector_db.collection_registry import collection_registry
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
@@ -10,3 +18,24 @@ async def health_check():
     Returns 200 OK if API is running.
     """
     return api_response.success(message="RAGify API is healthy 🚀", data={"status": "ok"})
+
+@router.get("/metrics")
+async def metrics():
+    """
+    Runtime counters used for capacity planning (cache hit rates, etc.).
+    """
+    embedding_cache = embedding_service.cache.stats() if embedding_service.cache else None
+    return api_response.success(
+        message="Metrics fetched successfully",
+        data={
+            "embedding_cache": embedding_cache,
+            "embedding_scheduler": embedding_service.scheduler.stats(),
+            "llm": llm_generator_stats(),
+            "qdrant_known_collections": len(collection_registry),
+            "semantic_cache": semantic_cache.stats(),
+            "user_cache": user_cache.stats(),
+            "password_hasher": password_hasher.stats(),
+            "ingestion_workers": ingestion_worker_pool.stats(),
+            "db_pool": pool_stats()
+        }
+    )
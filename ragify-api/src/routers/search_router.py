@@ -1,25 +1,100 @@
-from fastapi import APIRouter, Depends, Body
-from sqlalchemy.orm import Session
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Body, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.auth.dependencies import get_current_user
 from src.models.users import User
-from src.vector_db.dependencies import get_user_qdrant_manager
-from src.db import get_db
-from src.controllers.search_controller import SearchController
-from src.schemas.search_query import SearchQuery
+from src.vector_db.dependencies import get_user_async_qdrant_manager
+from src.db import get_async_db
+from src.controllers.retrieval_controller import RetrievalControllerAsync
+from src.schemas.search_query import SearchQuery, BatchSearchQuery, RetrieveQuery
 
 router = APIRouter(prefix="/search", tags=["Search"])
 
 @router.post("/")
-async def search_documents(  
+async def search_documents(
     body: SearchQuery = Body(...),
+    mode: Literal["dense", "hybrid"] = Query("dense", description="dense, or dense + BM25 fused with RRF"),
+    limit: int = Query(5, ge=1, le=50),
+    rerank: Optional[bool] = Query(None, description="Re-rank over-fetched candidates; defaults to RERANKER != none, true with RERANKER=none uses the lexical re-ranker"),
     current_user: User = Depends(get_current_user),
-    collection_manager = Depends(get_user_qdrant_manager),
-    db: Session = Depends(get_db)
+    collection_manager = Depends(get_user_async_qdrant_manager),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return await SearchController.search_documents_ai(  
+    return await RetrievalControllerAsync.search_documents_ai(
         query=body.query,
         session_name=body.session_name,
         current_user=current_user,
         collection_manager=collection_manager,
-        db=db
+        db=db,
+        mode=mode,
+        limit=limit,
+        rerank=rerank
+    )
+
+@router.post("/stream")
+async def search_documents_stream(
+    body: SearchQuery = Body(...),
+    mode: Literal["dense", "hybrid"] = Query("dense", description="dense, or dense + BM25 fused with RRF"),
+    limit: int = Query(5, ge=1, le=50),
+    rerank: Optional[bool] = Query(None, description="Re-rank over-fetched candidates; defaults to RERANKER != none, true with RERANKER=none uses the lexical re-ranker"),
+    current_user: User = Depends(get_current_user),
+    collection_manager = Depends(get_user_async_qdrant_manager)
+):
+    """Same as POST /search/ but streams the answer as Server-Sent Events."""
+    return StreamingResponse(
+        RetrievalControllerAsync.stream_search_documents_ai(
+            query=body.query,
+            session_name=body.session_name,
+            current_user=current_user,
+            collection_manager=collection_manager,
+            mode=mode,
+            limit=limit,
+            rerank=rerank
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/batch")
+async def search_documents_batch(
+    body: BatchSearchQuery = Body(...),
+    mode: Literal["dense", "hybrid"] = Query("dense", description="dense, or dense + BM25 fused with RRF"),
+    limit: int = Query(5, ge=1, le=50),
+    rerank: Optional[bool] = Query(None, description="Re-rank over-fetched candidates; defaults to RERANKER != none, true with RERANKER=none uses the lexical re-ranker"),
+    current_user: User = Depends(get_current_user),
+    collection_manager = Depends(get_user_async_qdrant_manager)
+):
+    """Search many questions at once; set `generate` to also answer each one."""
+    return await RetrievalControllerAsync.batch_search_documents(
+        queries=body.queries,
+        current_user=current_user,
+        collection_manager=collection_manager,
+        mode=mode,
+        limit=limit,
+        rerank=rerank,
+        generate=body.generate
+    )
+
+@router.post("/retrieve")
+async def retrieve_chunks(
+    body: RetrieveQuery = Body(...),
+    mode: Literal["dense", "hybrid"] = Query("dense", description="dense, or dense + BM25 fused with RRF"),
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    current_user: User = Depends(get_current_user),
+    collection_manager = Depends(get_user_async_qdrant_manager)
+):
+    """Ranked chunks only (no LLM answer), with payload filters and offset pagination."""
+    return await RetrievalControllerAsync.retrieve_chunks(
+        query=body.query,
+        collection_manager=collection_manager,
+        file_names=body.file_names,
+        file_types=body.file_types,
+        page_from=body.page_from,
+        page_to=body.page_to,
+        score_threshold=body.score_threshold,
+        mode=mode,
+        limit=limit,
+        offset=offset
     )
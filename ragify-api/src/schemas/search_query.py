@@ -0,0 +1,23 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from src.config import Config
+
+class SearchQuery(BaseModel):
+    query: str
+    session_name: Optional[str] = None
+
+class BatchSearchQuery(BaseModel):
+    queries: List[str] = Field(..., min_length=1, max_length=Config.SEARCH_BATCH_MAX_QUERIES)
+    generate: bool = False
+
+class RetrieveQuery(BaseModel):
+    query: str
+    file_names: Optional[List[str]] = None
+    file_types: Optional[List[str]] = None
+    page_from: Optional[int] = Field(None, ge=0)
+    page_to: Optional[int] = Field(None, ge=0)
+    score_threshold: Optional[float] = None
+
+class CrossCollectionQuery(BaseModel):
+    query: str
+    usernames: Optional[List[str]] = Field(None, description="Users whose collections to search; all users when omitted")
@@ -0,0 +1,150 @@
+import io
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+import numpy as np
+from sqlalchemy import Table, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from src.config import Config
+from src.models.chat_message import ChatMessage
+from src.models.chunks import Chunk, EMBEDDING_TYPE
+from src.models.vector_types import to_float32_bytes
+
+CHUNK_COLUMNS = ["text", "page_number", "file_name", "chunk_index", "content_hash", "document_id"]
+CHAT_MESSAGE_COLUMNS = ["session_id", "role", "content", "file_name", "page_number", "score"]
+
+
+# ---------------- COPY encoding ----------------
+def _copy_text(value) -> str:
+    """One field in COPY text format (tab separated, \\N for NULL)."""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_embedding(vector, mode: str = Config.CHUNK_EMBEDDING_STORAGE):
+    """Embedding literal for COPY in the column's input format."""
+    if vector is None:
+        return None
+    if mode == "float32":
+        return "\\x" + to_float32_bytes(vector).hex()
+    values = ",".join(map(repr, np.asarray(vector, dtype=np.float64).tolist()))
+    return f"[{values}]" if mode == "pgvector" else "{" + values + "}"
+
+
+def supports_copy(db: Session) -> bool:
+    return db.get_bind().dialect.driver == "psycopg2"
+
+
+def reserve_ids(db: Session, table: str, count: int) -> List[int]:
+    """
+    Take `count` ids from the table's serial sequence in one round trip, so
+    COPY (which cannot return generated keys) writes rows with known ids.
+    """
+    result = db.execute(
+        text("SELECT nextval(pg_get_serial_sequence(:table, 'id')) FROM generate_series(1, :count)"),
+        {"table": table, "count": count}
+    )
+    return list(result.scalars())
+
+
+def copy_rows(db: Session, table: str, columns: List[str], rows: Iterable[Sequence], batch_size: int = 5000) -> int:
+    """
+    Stream rows into `table` with COPY FROM STDIN on the session's connection,
+    `batch_size` rows per COPY so the buffer stays bounded. Runs inside the
+    session's transaction; the caller commits.
+    """
+    cursor = db.connection().connection.cursor()
+    statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    total = 0
+    buffer = io.StringIO()
+    pending = 0
+    try:
+        for row in rows:
+            buffer.write("\t".join(_copy_text(v) for v in row))
+            buffer.write("\n")
+            pending += 1
+            if pending >= batch_size:
+                buffer.seek(0)
+                cursor.copy_expert(statement, buffer)
+                total += pending
+                buffer = io.StringIO()
+                pending = 0
+        if pending:
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+            total += pending
+    finally:
+        cursor.close()
+    return total
+
+
+def _returning_insert(table: Table):
+    # insertmanyvalues: executemany batched into multi-row INSERT ... RETURNING, ids in row order
+    return insert(table).returning(table.c.id, sort_by_parameter_order=True)
+
+
+def bulk_insert(
+    db: Session,
+    table: Table,
+    columns: List[str],
+    rows: List[Dict],
+    encoders: Optional[Dict[str, Callable]] = None
+) -> List[int]:
+    """
+    Insert `rows` (dicts keyed by `columns`) and return their ids in order.
+    psycopg2: ids are reserved from the sequence, then the rows are COPYed.
+    Other drivers: batched INSERT ... RETURNING.
+    `encoders` convert values whose COPY text form differs from str().
+    """
+    if not rows:
+        return []
+
+    if supports_copy(db):
+        encoders = encoders or {}
+        ids = reserve_ids(db, table.name, len(rows))
+        copy_rows(db, table.name, ["id"] + columns, (
+            [row_id] + [encoders[c](row.get(c)) if c in encoders else row.get(c) for c in columns]
+            for row_id, row in zip(ids, rows)
+        ))
+        return ids
+
+    result = db.execute(_returning_insert(table), [{c: row.get(c) for c in columns} for row in rows])
+    return list(result.scalars())
+
+
+# ---------------- Chunks ----------------
+def insert_chunks(db: Session, rows: List[Dict]) -> List[int]:
+    """
+    Bulk insert chunk rows (CHUNK_COLUMNS, plus "embedding" when
+    CHUNK_EMBEDDING_STORAGE keeps a copy in Postgres) and return their ids.
+    """
+    if EMBEDDING_TYPE is None:
+        return bulk_insert(db, Chunk.__table__, CHUNK_COLUMNS, rows)
+    return bulk_insert(
+        db, Chunk.__table__, CHUNK_COLUMNS + ["embedding"], rows,
+        encoders={"embedding": _copy_embedding}
+    )
+
+
+# ---------------- Chat history ----------------
+def insert_chat_messages(db: Session, rows: List[Dict]) -> List[int]:
+    """Bulk insert chat_messages rows (CHAT_MESSAGE_COLUMNS) and return their ids."""
+    return bulk_insert(db, ChatMessage.__table__, CHAT_MESSAGE_COLUMNS, rows)
+
+
+async def insert_chat_messages_async(db: AsyncSession, rows: List[Dict]) -> List[int]:
+    """AsyncSession variant for request handlers: batched INSERT ... RETURNING."""
+    if not rows:
+        return []
+    table = ChatMessage.__table__
+    result = await db.execute(
+        _returning_insert(table),
+        [{c: row.get(c) for c in CHAT_MESSAGE_COLUMNS} for row in rows]
+    )
+    return list(result.scalars())
@@ -0,0 +1,40 @@
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from src.db import AsyncSessionLocal
+from src.models.users import User
+from src.services.semantic_cache import semantic_cache
+
+# Core statements on the table: ORM-level UPDATEs of User would also flush the user cache
+_users = User.__table__
+
+
+def _bump_statement(user_id: int):
+    return (
+        update(_users)
+        .where(_users.c.id == user_id)
+        .values(content_version=_users.c.content_version + 1)
+        .returning(_users.c.content_version)
+    )
+
+
+def invalidate_user_content(db: Session, user_id: int, namespace: str) -> int:
+    """Bump the user's content version (committed) and drop their cached answers in this process."""
+    version = db.execute(_bump_statement(user_id)).scalar_one()
+    db.commit()
+    semantic_cache.invalidate(namespace, version)
+    return version
+
+
+async def invalidate_user_content_async(db: AsyncSession, user_id: int, namespace: str) -> int:
+    """AsyncSession variant of invalidate_user_content."""
+    version = (await db.execute(_bump_statement(user_id))).scalar_one()
+    await db.commit()
+    semantic_cache.invalidate(namespace, version)
+    return version
+
+
+async def get_content_version(user_id: int) -> int:
+    """Current content version, read before retrieval so answers are cached against it."""
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(_users.c.content_version).where(_users.c.id == user_id)) or 0
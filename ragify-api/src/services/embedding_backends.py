@@ -0,0 +1,125 @@
+import hashlib
+import re
+from typing import List
+import numpy as np
+from src.config import Config
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class EmbeddingBackend:
+    """
+    Interface for an embedding provider.
+    `name` identifies the model (it is part of the embedding cache key) and
+    `embed` is a blocking batch call run on the embedding thread pool.
+    """
+
+    name: str = ""
+    dimension: int = 0
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        raise NotImplementedError
+
+
+class OpenAIEmbeddingBackend(EmbeddingBackend):
+    """Remote embeddings through the OpenAI API."""
+
+    def __init__(self, model: str = Config.OPENAI_EMBEDDING_MODEL, dimension: int = Config.EMBEDDING_DIMENSION):
+        import openai
+
+        openai.api_key = Config.OPENAI_API_KEY
+        self._openai = openai
+        self.name = model
+        self.dimension = dimension
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        response = self._openai.embeddings.create(model=self.name, input=texts)
+        return [d.embedding for d in response.data]
+
+
+class HashingEmbeddingBackend(EmbeddingBackend):
+    """
+    Deterministic local vectorizer (signed feature hashing over word unigrams
+    and bigrams, log-scaled and L2-normalized). No model download and no
+    network, so it suits tests and air-gapped deployments.
+    """
+
+    def __init__(self, dimension: int = Config.EMBEDDING_DIMENSION):
+        self.name = f"hashing-{dimension}"
+        self.dimension = dimension
+
+    @staticmethod
+    def _features(text: str) -> List[str]:
+        tokens = _TOKEN_RE.findall(text.lower())
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def _hash(self, feature: str):
+        digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        return digest % self.dimension, 1.0 if (digest >> 63) else -1.0
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        rows, cols, signs = [], [], []
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                col, sign = self._hash(feature)
+                rows.append(row)
+                cols.append(col)
+                signs.append(sign)
+
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        np.add.at(matrix, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), np.asarray(signs, dtype=np.float32))
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (matrix / norms).tolist()
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """Local CPU inference with a sentence-transformers model (optional dependency)."""
+
+    def __init__(self, model: str = Config.LOCAL_EMBEDDING_MODEL, batch_size: int = 64):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "EMBEDDING_BACKEND=sentence_transformers requires the 'sentence-transformers' package"
+            ) from e
+
+        self._model = SentenceTransformer(model, device="cpu")
+        self.name = model
+        self.dimension = self._model.get_sentence_embedding_dimension()
+        self.batch_size = batch_size
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        vectors = self._model.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        return vectors.astype(np.float32).tolist()
+
+
+EMBEDDING_BACKENDS = {
+    "openai": OpenAIEmbeddingBackend,
+    "hashing": HashingEmbeddingBackend,
+    "sentence_transformers": SentenceTransformerBackend,
+}
+
+
+def build_embedding_backend(name: str = Config.EMBEDDING_BACKEND) -> EmbeddingBackend:
+    """Instantiate the backend selected in Config."""
+    try:
+        backend_cls = EMBEDDING_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown embedding backend: {name}. Expected one of {sorted(EMBEDDING_BACKENDS)}")
+
+    backend = backend_cls()
+    if backend.dimension != Config.EMBEDDING_DIMENSION:
+        # Collections are sized from EMBEDDING_DIMENSION; a mismatch would fail every upsert
+        raise ValueError(
+            f"Embedding backend '{backend.name}' produces {backend.dimension}-d vectors "
+            f"but EMBEDDING_DIMENSION is {Config.EMBEDDING_DIMENSION}; set EMBEDDING_DIMENSION={backend.dimension}"
+        )
+    return backend
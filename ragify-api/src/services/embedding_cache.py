@@ -0,0 +1,204 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+from src.config import Config
+
+
+def make_cache_key(model: str, text: str) -> str:
+    """Content address of an embedding: the model name plus a SHA-256 of the text."""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+
+class EmbeddingCacheBackend:
+    """Interface for one tier of the embedding cache. Vectors are stored as float32 arrays."""
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, array]:
+        raise NotImplementedError
+
+    def set_many(self, items: Dict[str, array]) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class LRUEmbeddingCache(EmbeddingCacheBackend):
+    """In-process LRU tier."""
+
+    def __init__(self, max_items: int = 5000):
+        self.max_items = max_items
+        self._items: "OrderedDict[str, array]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, array]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._items.get(key)
+                if vector is not None:
+                    self._items.move_to_end(key)
+                    found[key] = vector
+        return found
+
+    def set_many(self, items: Dict[str, array]) -> None:
+        with self._lock:
+            for key, vector in items.items():
+                self._items[key] = vector
+                self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class SQLiteEmbeddingCache(EmbeddingCacheBackend):
+    """Persistent on-disk tier backed by a local SQLite file."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, array]:
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                batch = list(keys[i:i + 500])
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[key] = vector
+        return found
+
+    def set_many(self, items: Dict[str, array]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, vector.tobytes()) for key, vector in items.items()]
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+class TieredEmbeddingCache:
+    """
+    Two-tier embedding cache: an in-process LRU in front of an optional persistent store.
+    Persistent hits are promoted into memory. Counters are kept for sizing.
+
+    The persistent tier is best effort: its errors (e.g. "database is locked" when
+    several processes share EMBEDDING_CACHE_PATH) are logged and counted, reads
+    then fall through to the embedding backend and writes are skipped.
+    """
+
+    def __init__(self, memory: EmbeddingCacheBackend, persistent: Optional[EmbeddingCacheBackend] = None):
+        self.memory = memory
+        self.persistent = persistent
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.persistent_errors = 0
+
+    def _persistent_failed(self, operation: str, error: Exception):
+        self.persistent_errors += 1
+        print(f"⚠️ Embedding cache {operation} failed, continuing without the persistent tier: {error}")
+
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """Return the cached vectors for the given keys; missing keys are left out."""
+        unique_keys = list(dict.fromkeys(keys))
+        found = self.memory.get_many(unique_keys)
+        self.memory_hits += len(found)
+
+        missing = [k for k in unique_keys if k not in found]
+        if missing and self.persistent is not None:
+            try:
+                from_disk = await asyncio.to_thread(self.persistent.get_many, missing)
+            except Exception as e:
+                self._persistent_failed("read", e)
+                from_disk = {}
+            if from_disk:
+                self.persistent_hits += len(from_disk)
+                self.memory.set_many(from_disk)
+                found.update(from_disk)
+
+        self.misses += len(unique_keys) - len(found)
+        return {key: vector.tolist() for key, vector in found.items()}
+
+    async def set_many(self, items: Dict[str, List[float]]) -> None:
+        packed = {key: array("f", vector) for key, vector in items.items()}
+        self.memory.set_many(packed)
+        if self.persistent is not None:
+            try:
+                await asyncio.to_thread(self.persistent.set_many, packed)
+            except Exception as e:
+                self._persistent_failed("write", e)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.persistent is not None:
+            self.persistent.clear()
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.persistent_hits + self.misses
+        hits = self.memory_hits + self.persistent_hits
+        return {
+            "memory_hits": self.memory_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_items": len(self.memory),
+            "memory_capacity": getattr(self.memory, "max_items", None),
+            "persistent_enabled": self.persistent is not None,
+            "persistent_errors": self.persistent_errors,
+        }
+
+
+def build_embedding_cache() -> Optional[TieredEmbeddingCache]:
+    """Build the cache described by Config, or None when caching is disabled."""
+    if not Config.EMBEDDING_CACHE_ENABLED:
+        return None
+    persistent = None
+    if Config.EMBEDDING_CACHE_PATH:
+        try:
+            persistent = SQLiteEmbeddingCache(Config.EMBEDDING_CACHE_PATH)
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️ Embedding cache at {Config.EMBEDDING_CACHE_PATH} unavailable, using memory only: {e}")
+    return TieredEmbeddingCache(
+        memory=LRUEmbeddingCache(max_items=Config.EMBEDDING_CACHE_MAX_ITEMS),
+        persistent=persistent
+    )
@@ -0,0 +1,185 @@
+import asyncio
+import random
+from concurrent.futures import Executor
+from typing import Callable, List, Optional
+from src.config import Config
+from src.utils.tokens import count_tokens
+
+
+class RateLimitExhausted(Exception):
+    """Raised when a batch is still rate limited after all retries."""
+
+
+class _Job:
+    def __init__(self):
+        self.in_flight = 0
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_rate_limited(exc: Exception) -> bool:
+    return getattr(exc, "status_code", None) == 429
+
+
+class EmbeddingScheduler:
+    """
+    Process-wide scheduler for provider embedding requests.
+
+    - Packs texts into batches up to a per-request token budget.
+    - Keeps several batches in flight, bounded by a global concurrency limit.
+    - Splits that limit fairly between concurrent jobs (uploads, queries) so a
+      large document cannot take every slot.
+    - Halves the limit on HTTP 429 (once per backoff window), holds every
+      new request until the window has passed and backs off with jitter,
+      then slowly grows the limit again as requests succeed (AIMD).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = Config.EMBEDDING_MAX_CONCURRENCY,
+        max_batch_tokens: int = Config.EMBEDDING_MAX_BATCH_TOKENS,
+        max_batch_size: int = Config.EMBEDDING_MAX_BATCH_SIZE,
+        max_retries: int = Config.EMBEDDING_MAX_RETRIES,
+        base_delay: float = 1.0,
+        model: str = ""
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.model = model
+
+        self._limit = max_concurrency
+        self._in_flight = 0
+        self._active_jobs = 0
+        self._successes_since_backoff = 0
+        self._backoff_until = 0.0
+        self._cond = asyncio.Condition()
+
+        self.requests = 0
+        self.rate_limited = 0
+
+    # ---------------- Batch packing ----------------
+    def pack(self, texts: List[str]) -> List[List[int]]:
+        """Group text indexes into batches that fit the token and item limits."""
+        batches, current, current_tokens = [], [], 0
+        for i, text in enumerate(texts):
+            tokens = count_tokens(text, self.model)
+            if current and (current_tokens + tokens > self.max_batch_tokens or len(current) >= self.max_batch_size):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    # ---------------- Concurrency control ----------------
+    def _fair_share(self) -> int:
+        return max(1, -(-self._limit // max(1, self._active_jobs)))
+
+    async def _acquire(self, job: _Job):
+        loop = asyncio.get_running_loop()
+        async with self._cond:
+            while True:
+                await self._cond.wait_for(
+                    lambda: self._in_flight < self._limit and job.in_flight < self._fair_share()
+                )
+                delay = self._backoff_until - loop.time()
+                if delay <= 0:
+                    break
+                # After a 429 no batch starts until the backoff window has passed
+                try:
+                    await asyncio.wait_for(self._cond.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+            self._in_flight += 1
+            job.in_flight += 1
+
+    async def _release(self, job: _Job, backoff: Optional[float] = None):
+        """Free the slot; `backoff` (seconds) is set when the request was rate limited."""
+        async with self._cond:
+            self._in_flight -= 1
+            job.in_flight -= 1
+            if backoff is not None:
+                # 429s from one burst share a backoff window and halve the limit once
+                now = asyncio.get_running_loop().time()
+                if now >= self._backoff_until:
+                    self._limit = max(1, self._limit // 2)
+                    self._backoff_until = now + backoff
+                self._successes_since_backoff = 0
+            else:
+                self._successes_since_backoff += 1
+                if self._limit < self.max_concurrency and self._successes_since_backoff >= self._limit:
+                    self._limit += 1
+                    self._successes_since_backoff = 0
+            self._cond.notify_all()
+
+    async def _set_active(self, delta: int):
+        async with self._cond:
+            self._active_jobs += delta
+            self._cond.notify_all()
+
+    # ---------------- Execution ----------------
+    async def _run_batch(self, job: _Job, batch: List[str], embed_batch: Callable, executor: Optional[Executor]):
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(job)
+            backoff = None
+            try:
+                self.requests += 1
+                return await loop.run_in_executor(executor, embed_batch, batch)
+            except Exception as e:
+                if not _is_rate_limited(e):
+                    raise
+                self.rate_limited += 1
+                backoff = _retry_after(e) or self.base_delay * (2 ** attempt)
+                if attempt == self.max_retries:
+                    raise RateLimitExhausted(str(e)) from e
+            finally:
+                # Also runs on cancellation; shielded so a second cancel cannot leak the slot
+                await asyncio.shield(self._release(job, backoff))
+            await asyncio.sleep(backoff + random.uniform(0, backoff / 2))
+
+    async def run(self, texts: List[str], embed_batch: Callable[[List[str]], List[List[float]]], executor: Optional[Executor] = None) -> List[List[float]]:
+        """
+        Embed texts with the blocking embed_batch callable, running packed
+        batches concurrently on the executor. Results keep the input order.
+        """
+        if not texts:
+            return []
+
+        batches = self.pack(texts)
+        job = _Job()
+        await self._set_active(1)
+        try:
+            results = await asyncio.gather(*[
+                self._run_batch(job, [texts[i] for i in batch], embed_batch, executor)
+                for batch in batches
+            ])
+        finally:
+            await self._set_active(-1)
+
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        for batch, vectors in zip(batches, results):
+            for i, vector in zip(batch, vectors):
+                embeddings[i] = vector
+        return embeddings
+
+    def stats(self) -> dict:
+        return {
+            "concurrency_limit": self._limit,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "active_jobs": self._active_jobs,
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+        }
@@ -1,13 +1,17 @@
 import os
-from typing import List, Dict
-import openai
+from typing import List, Dict, Iterator
 from langchain_community.document_loaders import PyPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from docx import Document as DocxDocument
 from src.config import Config
-import asyncio
+from src.services.embedding_backends import EmbeddingBackend, build_embedding_backend
+from src.services.embedding_cache import build_embedding_cache, make_cache_key
+from src.services.embedding_scheduler import EmbeddingScheduler
 from concurrent.futures import ThreadPoolExecutor
 
+# Plain-text files are split into blocks of roughly this many characters
+TEXT_BLOCK_SIZE = 64 * 1024
+
 class EmbeddingService:
     _instance = None
 
@@ -16,72 +20,105 @@ class EmbeddingService:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self, embedding_model: str = Config.OPENAI_EMBEDDING_MODEL):
+    def __init__(self, backend: EmbeddingBackend = None):
         if getattr(self, "_initialized", False):
             return
-        self.model = embedding_model
-        openai.api_key = Config.OPENAI_API_KEY
-        self._executor = ThreadPoolExecutor(max_workers=4)
+        self.backend = backend or build_embedding_backend()
+        self.model = self.backend.name
+        self.dimension = self.backend.dimension
+        self._executor = ThreadPoolExecutor(max_workers=Config.EMBEDDING_MAX_CONCURRENCY)
+        self.scheduler = EmbeddingScheduler(model=self.model)
+        self.cache = build_embedding_cache()
+        self._text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=500,
+            chunk_overlap=50,
+            separators=["\n\n", "\n", " ", ""]
+        )
         self._initialized = True
 
     def process_document(self, file_path: str) -> List[Dict]:
+        return list(self.iter_chunks(file_path))
+
+    def iter_pages(self, file_path: str) -> Iterator[Dict]:
+        """
+        Yield the raw text of a document one page at a time, without holding
+        the whole document in memory.
+        """
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
         ext = os.path.splitext(file_path)[1].lower()
-        text_chunks = []
 
         if ext == ".pdf":
             loader = PyPDFLoader(file_path)
-            documents = loader.load()
-            for i, doc in enumerate(documents):
-                text_chunks.append({"text": doc.page_content, "page_number": i + 1})
+            for i, doc in enumerate(loader.lazy_load()):
+                yield {"text": doc.page_content, "page_number": i + 1}
         elif ext == ".docx":
             doc = DocxDocument(file_path)
             full_text = "\n".join([p.text for p in doc.paragraphs])
-            text_chunks.append({"text": full_text, "page_number": 1})
+            yield {"text": full_text, "page_number": 1}
         elif ext == ".txt":
+            # Read in blocks of whole lines so large text files are never fully loaded
             with open(file_path, "r", encoding="utf-8") as f:
-                text_chunks.append({"text": f.read(), "page_number": 1})
+                block = []
+                block_size = 0
+                for line in f:
+                    block.append(line)
+                    block_size += len(line)
+                    if block_size >= TEXT_BLOCK_SIZE:
+                        yield {"text": "".join(block), "page_number": 1}
+                        block, block_size = [], 0
+                if block:
+                    yield {"text": "".join(block), "page_number": 1}
         else:
             raise ValueError(f"Unsupported file type: {ext}")
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=500,
-            chunk_overlap=50,
-            separators=["\n\n", "\n", " ", ""]
-        )
-
-        final_chunks = []
-        for chunk in text_chunks:
-            split_texts = text_splitter.split_text(chunk["text"])
-            for st in split_texts:
-                final_chunks.append({
+    def iter_chunks(self, file_path: str) -> Iterator[Dict]:
+        """Yield cleaned, split chunks page by page."""
+        for page in self.iter_pages(file_path):
+            for st in self._text_splitter.split_text(page["text"]):
+                yield {
                     "text": self.clean_text(st),
-                    "page_number": chunk["page_number"]
-                })
-
-        return final_chunks
+                    "page_number": page["page_number"]
+                }
 
     async def embed_text_async(self, texts: List[str]) -> List[List[float]]:
         """
-        Async wrapper for embedding texts in batches using threads.
+        Embed texts, serving repeated (model, text) pairs from the embedding cache.
+        Only cache misses are sent to the provider.
         """
-        loop = asyncio.get_event_loop()
-        embeddings = []
+        if self.cache is None or not texts:
+            return await self._embed_uncached(texts)
+
+        keys = [make_cache_key(self.model, t) for t in texts]
+        cached = await self.cache.get_many(keys)
 
-        for i in range(0, len(texts), 100):
-            batch = texts[i:i+100]
-            batch_embeddings = await loop.run_in_executor(self._executor, self.embed_text_sync, batch)
-            embeddings.extend(batch_embeddings)
-        return embeddings
+        # Embed each missing text once, even if it repeats within the request
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        if missing:
+            new_embeddings = await self._embed_uncached(list(missing.values()))
+            fresh = dict(zip(missing.keys(), new_embeddings))
+            await self.cache.set_many(fresh)
+            cached.update(fresh)
+
+        return [cached[key] for key in keys]
+
+    async def _embed_uncached(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts through the shared scheduler: token-packed batches run
+        concurrently on the thread pool with rate-limit backoff.
+        """
+        return await self.scheduler.run(texts, self.embed_text_sync, self._executor)
 
     def embed_text_sync(self, texts: List[str]) -> List[List[float]]:
         """
-        Synchronous batch embedding call to OpenAI
+        Synchronous batch embedding call to the configured backend
         """
-        response = openai.embeddings.create(model=self.model, input=texts)
-        return [d.embedding for d in response.data]
+        return self.backend.embed(texts)
 
     @staticmethod
     def clean_text(text: str) -> str:
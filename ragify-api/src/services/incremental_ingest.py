@@ -0,0 +1,143 @@
+import asyncio
+from typing import Dict, List, Tuple
+from sqlalchemy import update
+from sqlalchemy.orm import Session, load_only
+from src.models.chunks import Chunk
+from src.models.documents import Document
+from src.services.bulk_writer import insert_chunks
+from src.services.ingestion_pipeline import content_hash, ingestion_pipeline
+from src.utils.async_utils import call_maybe_async
+from src.vector_db.qdrant_manager import make_point_id
+
+
+def _keyed_chunks(chunks: List[Dict]) -> Dict[Tuple[str, int], Dict]:
+    """
+    Key chunks by (content hash, occurrence) so repeated boilerplate chunks
+    inside one document stay distinct.
+    """
+    seen: Dict[str, int] = {}
+    keyed = {}
+    for index, chunk in enumerate(chunks):
+        digest = chunk.get("content_hash") or content_hash(chunk["text"])
+        occurrence = seen.get(digest, 0)
+        seen[digest] = occurrence + 1
+        keyed[(digest, occurrence)] = {**chunk, "chunk_index": index, "content_hash": digest, "occurrence": occurrence}
+    return keyed
+
+
+async def reingest_document(
+    db: Session,
+    document: Document,
+    file_path: str,
+    collection_manager,
+    extra_payload: Dict = None
+) -> Dict:
+    """
+    Re-ingest a new version of an existing document, embedding and upserting
+    only the chunks whose content changed and deleting the ones that went away.
+
+    The new version is streamed through the ingestion pipeline, so only the
+    changed chunks of the current batch are held in memory. Documents stored
+    without content hashes (or without chunk rows) are replaced in full once;
+    unchanged chunks still come back from the embedding cache.
+    """
+    document_id, file_name = document.id, document.file_name
+
+    def load_existing():
+        # Chunk text is not needed for the diff, only the stored keys
+        return (
+            db.query(Chunk)
+            .options(load_only(Chunk.id, Chunk.chunk_index, Chunk.page_number, Chunk.content_hash))
+            .filter(Chunk.document_id == document_id)
+            .order_by(Chunk.id)
+            .all()
+        )
+
+    existing_rows = await asyncio.to_thread(load_existing)
+    legacy = not existing_rows or any(row.content_hash is None for row in existing_rows)
+
+    if legacy:
+        old_keyed = {}
+    else:
+        # Plain values: the session expires the rows on every batch commit below
+        old_keyed = _keyed_chunks([
+            {"content_hash": row.content_hash, "row_id": row.id, "position": (row.chunk_index, row.page_number)}
+            for row in sorted(existing_rows, key=lambda r: (r.chunk_index is None, r.chunk_index, r.id))
+        ])
+
+    base_payload = {**(extra_payload or {}), "file_name": file_name, "document_id": document_id}
+
+    if legacy:
+        await call_maybe_async(collection_manager.delete_by_file_name, file_name)
+
+        def clear_chunks():
+            db.query(Chunk).filter(Chunk.document_id == document_id).delete()
+            db.commit()
+
+        await asyncio.to_thread(clear_chunks)
+
+    # Position of every chunk in the new version, keyed like old_keyed
+    new_positions: Dict[Tuple[str, int], Dict] = {}
+
+    def select(chunk: Dict) -> bool:
+        key = (chunk["content_hash"], chunk["occurrence"])
+        new_positions[key] = {"chunk_index": chunk["chunk_index"], "page_number": chunk["page_number"]}
+        return key not in old_keyed
+
+    async def persist(batch: List[Dict], vectors: List[List[float]]):
+        def write():
+            insert_chunks(db, [
+                {
+                    "text": chunk["text"],
+                    "embedding": vector,
+                    "page_number": chunk["page_number"],
+                    "file_name": file_name,
+                    "chunk_index": chunk["chunk_index"],
+                    "content_hash": chunk["content_hash"],
+                    "document_id": document_id,
+                }
+                for chunk, vector in zip(batch, vectors)
+            ])
+            db.commit()
+
+        await asyncio.to_thread(write)
+
+    # ---------------- Added chunks: Vector DB + SQL DB ----------------
+    stats = await ingestion_pipeline.run(
+        file_path, collection_manager, base_payload=base_payload, on_batch=persist, select=select
+    )
+
+    removed = [key for key in old_keyed if key not in new_positions]
+    moved = [
+        key for key, position in new_positions.items()
+        if key in old_keyed and old_keyed[key]["position"] != (position["chunk_index"], position["page_number"])
+    ]
+
+    # ---------------- Removed and moved chunks: Vector DB ----------------
+    await call_maybe_async(
+        collection_manager.delete_points,
+        [make_point_id({**base_payload, **old_keyed[key]}) for key in removed]
+    )
+    await call_maybe_async(collection_manager.update_payloads, [
+        (make_point_id({**base_payload, "content_hash": key[0], "occurrence": key[1]}), new_positions[key])
+        for key in moved
+    ])
+
+    # ---------------- Removed and moved chunks: SQL DB ----------------
+    def sync_chunks():
+        removed_ids = [old_keyed[key]["row_id"] for key in removed]
+        if removed_ids:
+            db.query(Chunk).filter(Chunk.id.in_(removed_ids)).delete(synchronize_session=False)
+        if moved:
+            # ORM bulk UPDATE by primary key, one executemany
+            db.execute(update(Chunk), [{"id": old_keyed[key]["row_id"], **new_positions[key]} for key in moved])
+        db.commit()
+
+    await asyncio.to_thread(sync_chunks)
+
+    return {
+        "added": stats["chunks"],
+        "removed": len(removed) if not legacy else len(existing_rows),
+        "unchanged": len(new_positions) - stats["chunks"],
+        "full_reingest": legacy,
+    }
@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional
+from src.services.embedding_service import embedding_service
+from src.utils.async_utils import call_maybe_async
+
+# Sentinel passed down the queues once a stage has no more work
+_DONE = object()
+
+BatchSink = Callable[[List[Dict], List[List[float]]], Awaitable[None]]
+ChunkFilter = Callable[[Dict], bool]
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class IngestionPipeline:
+    """
+    Streaming ingestion: pages -> chunks -> embedding batches -> Qdrant upserts.
+
+    Each stage runs concurrently and hands work to the next through a bounded
+    queue, so parsing, embedding and upserting overlap and peak memory depends
+    on batch_size * queue_size rather than on the size of the document.
+    """
+
+    def __init__(self, embedder=embedding_service, batch_size: int = 100, queue_size: int = 4):
+        self.embedder = embedder
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+
+    async def run(
+        self,
+        file_path: str,
+        collection_manager,
+        base_payload: Optional[Dict] = None,
+        on_batch: Optional[BatchSink] = None,
+        select: Optional[ChunkFilter] = None
+    ) -> Dict:
+        """
+        Ingest a file into the given collection manager.
+
+        base_payload is merged into every point payload (file_name, document_id, ...).
+        Every chunk carries chunk_index, content_hash and occurrence, so points
+        get the same ids as on an incremental re-ingest.
+        select, if given, is called (in the parser thread) with every chunk and
+        returns whether it should be embedded and upserted.
+        on_batch, if given, is awaited after each upsert with the chunk dicts and
+        their vectors so callers can persist chunk rows batch by batch.
+        """
+        chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        vector_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        stats = {"chunks": 0, "batches": 0}
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._parse(file_path, base_payload or {}, select, chunk_queue, stop))
+                tg.create_task(self._embed(chunk_queue, vector_queue))
+                tg.create_task(self._upsert(vector_queue, collection_manager, on_batch, stats))
+        except BaseExceptionGroup as group:
+            stop.set()
+            # Surface the original failure rather than the TaskGroup wrapper
+            raise group.exceptions[0]
+        return stats
+
+    async def _parse(
+        self,
+        file_path: str,
+        base_payload: Dict,
+        select: Optional[ChunkFilter],
+        out: asyncio.Queue,
+        stop: threading.Event
+    ):
+        """Run the blocking parser in a worker thread, applying backpressure from the queue."""
+        loop = asyncio.get_running_loop()
+
+        def put(item):
+            future = asyncio.run_coroutine_threadsafe(out.put(item), loop)
+            while not stop.is_set():
+                try:
+                    return future.result(timeout=0.5)
+                except TimeoutError:
+                    continue
+            future.cancel()
+            raise RuntimeError("Ingestion pipeline stopped")
+
+        def produce():
+            batch = []
+            occurrences: Dict[str, int] = {}
+            for index, chunk in enumerate(self.embedder.iter_chunks(file_path)):
+                if stop.is_set():
+                    return
+                # (content_hash, occurrence) keeps repeated boilerplate chunks distinct
+                digest = content_hash(chunk["text"])
+                occurrence = occurrences.get(digest, 0)
+                occurrences[digest] = occurrence + 1
+                chunk = {**base_payload, **chunk, "chunk_index": index, "content_hash": digest, "occurrence": occurrence}
+                if select is not None and not select(chunk):
+                    continue
+                batch.append(chunk)
+                if len(batch) >= self.batch_size:
+                    put(batch)
+                    batch = []
+            if batch:
+                put(batch)
+
+        try:
+            await asyncio.to_thread(produce)
+        except BaseException:
+            stop.set()
+            raise
+        await out.put(_DONE)
+
+    async def _embed(self, inbox: asyncio.Queue, out: asyncio.Queue):
+        while (batch := await inbox.get()) is not _DONE:
+            vectors = await self.embedder.embed_text_async([c["text"] for c in batch])
+            await out.put((batch, vectors))
+        await out.put(_DONE)
+
+    async def _upsert(self, inbox: asyncio.Queue, collection_manager, on_batch: Optional[BatchSink], stats: Dict):
+        while (item := await inbox.get()) is not _DONE:
+            batch, vectors = item
+            await call_maybe_async(collection_manager.insert_data, vectors, batch)
+            if on_batch is not None:
+                await on_batch(batch, vectors)
+            stats["chunks"] += len(batch)
+            stats["batches"] += 1
+
+
+# Shared instance
+ingestion_pipeline = IngestionPipeline()
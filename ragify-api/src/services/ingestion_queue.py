@@ -0,0 +1,253 @@
+import asyncio
+import mimetypes
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from fastapi import UploadFile
+from sqlalchemy import exists, or_
+from sqlalchemy.orm import Session, aliased
+from starlette.datastructures import Headers
+from src.config import Config
+from src.db import SessionLocal
+from src.models.ingestion_jobs import IngestionJob
+from src.models.users import User
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def job_to_dict(job: IngestionJob) -> dict:
+    return {
+        "id": job.id,
+        "file_name": job.file_name,
+        "status": job.status,
+        "attempts": job.attempts,
+        "error": job.error,
+        "document_id": job.document_id,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+# ---------------- Queue operations (blocking, run in threads) ----------------
+def _running_same_file(other, user_id, file_name, job_id, stale_before) -> tuple:
+    """Conditions for `other` being a live (not stale) run of the same user's file."""
+    return (
+        other.user_id == user_id,
+        other.file_name == file_name,
+        other.id != job_id,
+        other.status == "running",
+        other.started_at >= stale_before,
+    )
+
+
+def claim_job(db: Session, worker_id: str) -> Optional[IngestionJob]:
+    """
+    Atomically take the oldest runnable job. Jobs left "running" longer than
+    INGEST_STALE_AFTER (worker crashed or restarted) are picked up again until
+    they reach INGEST_MAX_ATTEMPTS; after that they are marked failed.
+    FOR UPDATE SKIP LOCKED lets many workers poll the table without contention.
+
+    Jobs for the same (user, file_name) run one at a time, so two uploads of
+    one file cannot both create a Document: a job is skipped while another
+    one for that file is running, re-checked under a lock on the user row.
+    """
+    stale_before = utcnow() - timedelta(seconds=Config.INGEST_STALE_AFTER)
+    stale = (IngestionJob.status == "running") & (IngestionJob.started_at < stale_before)
+    fail_exhausted_jobs(db, stale)
+
+    other = aliased(IngestionJob)
+    same_file_running = exists().where(
+        *_running_same_file(other, IngestionJob.user_id, IngestionJob.file_name, IngestionJob.id, stale_before)
+    )
+    job = (
+        db.query(IngestionJob)
+        .filter(
+            or_(
+                IngestionJob.status == "queued",
+                stale & (IngestionJob.attempts < Config.INGEST_MAX_ATTEMPTS)
+            ),
+            ~same_file_running
+        )
+        .order_by(IngestionJob.created_at, IngestionJob.id)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+    if job is None:
+        db.rollback()
+        return None
+
+    # Claims for one user queue here; a concurrent claim of the same file has committed by the re-check
+    db.query(User.id).filter(User.id == job.user_id).with_for_update().first()
+    conflict = db.query(other.id).filter(
+        *_running_same_file(other, job.user_id, job.file_name, job.id, stale_before)
+    ).first()
+    if conflict is not None:
+        db.rollback()
+        return None
+    job.status = "running"
+    job.attempts += 1
+    job.worker_id = worker_id
+    job.started_at = utcnow()
+    db.commit()
+    return job
+
+
+def fail_exhausted_jobs(db: Session, stale) -> int:
+    """
+    Mark stale running jobs that already used every attempt as failed, so a
+    document that keeps killing its worker is not reclaimed forever.
+    """
+    jobs = (
+        db.query(IngestionJob)
+        .filter(stale, IngestionJob.attempts >= Config.INGEST_MAX_ATTEMPTS)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not jobs:
+        return 0
+    now = utcnow()
+    for job in jobs:
+        job.status = "failed"
+        job.error = f"Worker stopped responding; gave up after {job.attempts} attempts"
+        job.finished_at = now
+    paths = [job.file_path for job in jobs]
+    db.commit()
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+    return len(jobs)
+
+
+def finish_job(db: Session, job: IngestionJob, document_id: Optional[int] = None, error: Optional[str] = None) -> bool:
+    """Record the outcome; a failed job is re-queued until INGEST_MAX_ATTEMPTS. Returns True if the job is final."""
+    if error is None:
+        job.status = "done"
+        job.error = None
+        job.document_id = document_id
+    else:
+        job.error = error
+        job.status = "failed" if job.attempts >= Config.INGEST_MAX_ATTEMPTS else "queued"
+    if job.status != "queued":
+        job.finished_at = utcnow()
+    db.commit()
+    return job.status != "queued"
+
+
+# ---------------- Worker pool ----------------
+class IngestionWorkerPool:
+    """
+    Runs up to `concurrency` ingestion jobs at a time from the ingestion_jobs table.
+    Several pools (API workers and/or scripts/ingestion_worker.py processes) can
+    share one table; jobs survive restarts because their state lives in the DB.
+    """
+
+    def __init__(self, concurrency: int = Config.INGEST_WORKERS, poll_interval: float = Config.INGEST_POLL_INTERVAL):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._tasks: List[asyncio.Task] = []
+        self._stop = asyncio.Event()
+        self.processed = 0
+        self.failed = 0
+        self.active = 0
+
+    def start(self):
+        if self._tasks:
+            return
+        self._stop = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(f"{self.worker_prefix}:{i}"))
+            for i in range(self.concurrency)
+        ]
+        print(f"✅ Ingestion workers started ({self.concurrency})")
+
+    async def stop(self):
+        """Stop polling and let in-flight jobs finish."""
+        self._stop.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_forever(self):
+        self.start()
+        await asyncio.gather(*self._tasks)
+
+    async def _worker(self, worker_id: str):
+        while not self._stop.is_set():
+            db = SessionLocal()
+            try:
+                job = await asyncio.to_thread(claim_job, db, worker_id)
+                if job is None:
+                    try:
+                        await asyncio.wait_for(self._stop.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                self.active += 1
+                try:
+                    await self._process(db, job)
+                finally:
+                    self.active -= 1
+            except Exception as e:
+                print(f"❌ Ingestion worker {worker_id} error: {e}")
+                await asyncio.sleep(self.poll_interval)
+            finally:
+                db.close()
+
+    async def _process(self, db: Session, job: IngestionJob):
+        # Imported here: the controller pulls in the embedding/LLM stack
+        from src.controllers.document_controller import upload_document_to_r2
+        from src.vector_db.qdrant_manager import qdrant_manager
+
+        error = None
+        document_id = None
+        try:
+            user = await asyncio.to_thread(lambda: db.get(User, job.user_id))
+            if user is None:
+                raise ValueError("User no longer exists")
+            # The first call connects the sync client (blocking, with retries): keep it off the loop
+            collection_manager = await asyncio.to_thread(qdrant_manager.get_user_collection_manager, user)
+            await asyncio.to_thread(collection_manager.create_collection)
+
+            content_type = mimetypes.guess_type(job.file_name)[0] or "application/octet-stream"
+            with open(job.file_path, "rb") as f:
+                upload = UploadFile(file=f, filename=job.file_name, headers=Headers({"content-type": content_type}))
+                doc_meta = await upload_document_to_r2(
+                    file=upload,
+                    file_path=job.file_path,
+                    db=db,
+                    current_user=user,
+                    collection_manager=collection_manager
+                )
+            document_id = doc_meta.get("id")
+        except Exception as e:
+            db.rollback()
+            error = str(e) or e.__class__.__name__
+
+        final = await asyncio.to_thread(finish_job, db, job, document_id, error)
+        if error is None:
+            self.processed += 1
+            print(f"✅ Ingestion job {job.id} done: {job.file_name}")
+        else:
+            print(f"❌ Ingestion job {job.id} attempt {job.attempts} failed: {error}")
+            if final:
+                self.failed += 1
+
+        if final and os.path.exists(job.file_path):
+            await asyncio.to_thread(os.remove, job.file_path)
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "active": self.active,
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+
+
+# Singleton instance
+ingestion_worker_pool = IngestionWorkerPool()
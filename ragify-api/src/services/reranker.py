@@ -0,0 +1,151 @@
+import asyncio
+import math
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+from src.config import Config
+from src.services.sparse_encoder import SparseEncoder
+
+
+class Reranker:
+    """
+    Interface for a second-stage scorer.
+    `score` is a blocking CPU call returning one relevance score per text
+    (higher is better); it runs off the event loop.
+    """
+
+    name: str = ""
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        raise NotImplementedError
+
+
+class LexicalReranker(Reranker):
+    """
+    BM25 over the candidate set itself (IDF taken from the candidates).
+    Cheap and deterministic, so it suits tests and hosts without a model.
+    """
+
+    name = "lexical"
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        query_terms = set(SparseEncoder.tokenize(query))
+        docs = [Counter(SparseEncoder.tokenize(t)) for t in texts]
+        if not query_terms or not docs:
+            return [0.0] * len(texts)
+
+        avg_length = sum(sum(d.values()) for d in docs) / len(docs) or 1.0
+        n = len(docs)
+        idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for term in query_terms
+            for df in [sum(1 for d in docs if term in d)]
+        }
+
+        scores = []
+        for doc in docs:
+            length_norm = self.k1 * (1 - self.b + self.b * sum(doc.values()) / avg_length)
+            scores.append(sum(
+                (idf[term] * doc[term] * (self.k1 + 1) / (doc[term] + length_norm)
+                 for term in query_terms if term in doc),
+                0.0
+            ))
+        return scores
+
+
+class CrossEncoderReranker(Reranker):
+    """CPU cross-encoder over (query, passage) pairs (optional dependency)."""
+
+    def __init__(self, model: str = Config.RERANK_MODEL, batch_size: int = 32):
+        try:
+            from sentence_transformers import CrossEncoder
+        except ImportError as e:
+            raise ImportError("RERANKER=cross_encoder requires the 'sentence-transformers' package") from e
+
+        self._model = CrossEncoder(model, device="cpu")
+        self.name = model
+        self.batch_size = batch_size
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        if not texts:
+            return []
+        scores = self._model.predict([(query, t) for t in texts], batch_size=self.batch_size)
+        return [float(s) for s in scores]
+
+
+RERANKERS = {
+    "lexical": LexicalReranker,
+    "cross_encoder": CrossEncoderReranker,
+}
+
+
+def build_reranker(name: str = Config.RERANKER) -> Optional[Reranker]:
+    """Instantiate the re-ranker selected in Config; "none" disables the stage."""
+    if not name or name == "none":
+        return None
+    try:
+        return RERANKERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown reranker: {name}. Expected one of {sorted(RERANKERS)} or 'none'")
+
+
+_reranker = None
+_reranker_loaded = False
+_reranker_lock = threading.Lock()
+
+# Used when a request asks for re-ranking explicitly while RERANKER=none
+_fallback_reranker = LexicalReranker()
+
+def get_reranker() -> Optional[Reranker]:
+    """
+    Shared re-ranker, loaded on first use (cross-encoder weights are large).
+    Blocking: call it from a thread or at startup, or use load_reranker.
+    """
+    global _reranker, _reranker_loaded
+    with _reranker_lock:
+        if not _reranker_loaded:
+            _reranker = build_reranker()
+            _reranker_loaded = True
+    return _reranker
+
+
+async def load_reranker() -> Optional[Reranker]:
+    """get_reranker without blocking the event loop while the model loads."""
+    if _reranker_loaded:
+        return _reranker
+    return await asyncio.to_thread(get_reranker)
+
+
+async def select_reranker(requested: Optional[bool] = None) -> Optional[Reranker]:
+    """
+    Re-ranker for one request. None follows RERANKER, False disables the stage,
+    True uses the configured re-ranker or LexicalReranker when RERANKER=none.
+    """
+    if requested is False:
+        return None
+    reranker = await load_reranker()
+    if reranker is None and requested:
+        return _fallback_reranker
+    return reranker
+
+
+async def rerank(query: str, context: List[Dict], top_k: int, reranker: Reranker = None) -> List[Dict]:
+    """
+    Re-score retrieved chunks and keep the best `top_k`.
+    The vector similarity is kept as `vector_score`; `score` becomes the re-ranker's.
+    """
+    reranker = reranker or await load_reranker()
+    if reranker is None or not context:
+        return context[:top_k]
+
+    scores = await asyncio.to_thread(reranker.score, query, [c["text"] for c in context])
+    ranked = sorted(
+        ({**c, "vector_score": c["score"], "score": s} for c, s in zip(context, scores)),
+        key=lambda c: c["score"],
+        reverse=True
+    )
+    return ranked[:top_k]
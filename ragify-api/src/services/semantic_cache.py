@@ -0,0 +1,204 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from src.config import Config
+
+
+class _Partition:
+    """Cached answers for one (collection, retrieval variant), with a stacked matrix for fast lookup."""
+
+    def __init__(self):
+        self.vectors: List[np.ndarray] = []
+        self.answers: List[dict] = []
+        self.sources: List[Optional[list]] = []
+        self.created_at: List[float] = []
+        self.versions: List[int] = []
+        self.matrix: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def pop_oldest(self, count: int = 1):
+        del self.vectors[:count], self.answers[:count], self.sources[:count]
+        del self.created_at[:count], self.versions[:count]
+        self.matrix = None
+
+
+class SemanticAnswerCache:
+    """
+    Answer cache keyed by query embedding similarity.
+
+    Every collection has a content version, persisted on the owning user
+    (users.content_version, see src/services/content_version.py) so uploads
+    processed by a standalone ingestion worker are seen by every API process.
+    Callers read the version before retrieval and pass it to lookup and store:
+    entries remember the version they were answered against, a newer version
+    drops the collection's cached answers, and answers computed against an
+    older version are never stored. A lookup returns the answer of the most
+    similar cached query if its cosine similarity reaches `threshold`;
+    entries older than `ttl` seconds are evicted.
+
+    Each (collection, variant) partition keeps at most `max_entries` answers
+    and the whole cache at most `max_total_entries`: past that, the oldest
+    answers of the least recently used partitions go first. Partitions are
+    removed once empty.
+    """
+
+    def __init__(
+        self,
+        threshold: float = Config.SEMANTIC_CACHE_THRESHOLD,
+        ttl: float = Config.SEMANTIC_CACHE_TTL,
+        max_entries: int = Config.SEMANTIC_CACHE_MAX_ENTRIES,
+        max_total_entries: int = Config.SEMANTIC_CACHE_MAX_TOTAL_ENTRIES
+    ):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_total_entries = max_total_entries
+        self._versions: Dict[str, int] = {}
+        # Least recently used partition first
+        self._partitions: "OrderedDict[Tuple[str, str], _Partition]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    def version(self, collection_name: str) -> int:
+        return self._versions.get(collection_name, 0)
+
+    def _remove(self, key: Tuple[str, str]):
+        self._size -= len(self._partitions.pop(key))
+
+    def _drop(self, collection_name: str):
+        for key in [k for k in self._partitions if k[0] == collection_name]:
+            self._remove(key)
+
+    def _observe(self, collection_name: str, version: int):
+        """Record a content version; a newer one drops the collection's cached answers."""
+        if version > self.version(collection_name):
+            self._versions[collection_name] = version
+            self._drop(collection_name)
+            self.invalidations += 1
+
+    def _evict_expired(self, key: Tuple[str, str]) -> Optional[_Partition]:
+        """Drop the partition's expired entries; returns the partition, or None once it is empty."""
+        partition = self._partitions.get(key)
+        if partition is None:
+            return None
+        # Entries are appended in time order, so the expired ones are a prefix
+        cutoff = time.monotonic() - self.ttl
+        expired = 0
+        while expired < len(partition) and partition.created_at[expired] < cutoff:
+            expired += 1
+        if expired:
+            partition.pop_oldest(expired)
+            self._size -= expired
+        if not partition:
+            del self._partitions[key]
+            return None
+        return partition
+
+    def _enforce_total_limit(self):
+        while self._size > self.max_total_entries and self._partitions:
+            key = next(iter(self._partitions))
+            if self._evict_expired(key) is None:
+                continue
+            partition = self._partitions[key]
+            partition.pop_oldest()
+            self._size -= 1
+            self.evictions += 1
+            if not partition:
+                del self._partitions[key]
+
+    def invalidate(self, collection_name: str, version: int):
+        """Drop the collection's cached answers after its content changed to `version`."""
+        with self._lock:
+            self._versions[collection_name] = max(version, self.version(collection_name))
+            self._drop(collection_name)
+            self.invalidations += 1
+
+    def lookup_entry(
+        self, collection_name: str, query_vector, variant: str = "", version: int = 0
+    ) -> Optional[Tuple[dict, Optional[list]]]:
+        """Like lookup, returning (answer, sources) with the sources stored alongside the answer."""
+        key = (collection_name, variant)
+        with self._lock:
+            self._observe(collection_name, version)
+            partition = self._evict_expired(key)
+            if partition is None:
+                self.misses += 1
+                return None
+            self._partitions.move_to_end(key)
+
+            if partition.matrix is None:
+                partition.matrix = np.stack(partition.vectors)
+            similarities = partition.matrix @ self._normalize(query_vector)
+            best = int(np.argmax(similarities))
+
+            if similarities[best] < self.threshold or partition.versions[best] != version:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return partition.answers[best], partition.sources[best]
+
+    def lookup(self, collection_name: str, query_vector, variant: str = "", version: int = 0) -> Optional[dict]:
+        entry = self.lookup_entry(collection_name, query_vector, variant=variant, version=version)
+        return entry[0] if entry is not None else None
+
+    def store(
+        self,
+        collection_name: str,
+        query_vector,
+        answer: dict,
+        variant: str = "",
+        version: int = 0,
+        sources: Optional[list] = None
+    ):
+        """Cache an answer computed against content `version`; stale answers are discarded."""
+        key = (collection_name, variant)
+        with self._lock:
+            self._observe(collection_name, version)
+            if version < self.version(collection_name):
+                return
+            partition = self._evict_expired(key)
+            if partition is None:
+                partition = self._partitions[key] = _Partition()
+            self._partitions.move_to_end(key)
+            partition.vectors.append(self._normalize(query_vector))
+            partition.answers.append(answer)
+            partition.sources.append(sources)
+            partition.created_at.append(time.monotonic())
+            partition.versions.append(version)
+            partition.matrix = None
+            self._size += 1
+            if len(partition) > self.max_entries:
+                # Oldest entries go first
+                partition.pop_oldest()
+                self._size -= 1
+            self._enforce_total_limit()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "entries": self._size,
+            "partitions": len(self._partitions),
+        }
+
+
+# Singleton instance
+semantic_cache = SemanticAnswerCache()
@@ -0,0 +1,70 @@
+import hashlib
+import re
+from collections import Counter
+from typing import List
+from qdrant_client.http import models as rest
+
+# Keeps identifiers such as part numbers and error codes ("E-1234", "v2.1") whole
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-_./][a-z0-9]+)*")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+class SparseEncoder:
+    """
+    BM25 term weighting for Qdrant sparse vectors.
+
+    Documents get the BM25 term-frequency component; the IDF component is
+    applied by Qdrant itself (sparse vector `modifier=IDF`), so collection
+    statistics never have to be tracked here. Queries use unit weights.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, avg_doc_length: float = 80.0):
+        self.k1 = k1
+        self.b = b
+        self.avg_doc_length = avg_doc_length
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        tokens = []
+        for token in _TOKEN_RE.findall(text.lower()):
+            if token in _STOPWORDS:
+                continue
+            tokens.append(token)
+            # Also index the parts of compound tokens so "E-1234" matches "1234"
+            if any(sep in token for sep in "-_./"):
+                tokens.extend(part for part in re.split(r"[-_./]", token) if part and part not in _STOPWORDS)
+        return tokens
+
+    @staticmethod
+    def token_id(token: str) -> int:
+        return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little")
+
+    def _to_sparse(self, weights: dict) -> rest.SparseVector:
+        # Different tokens can hash to the same index; sum their weights
+        merged = Counter()
+        for token, weight in weights.items():
+            merged[self.token_id(token)] += weight
+        indices = sorted(merged)
+        return rest.SparseVector(indices=indices, values=[float(merged[i]) for i in indices])
+
+    def encode_document(self, text: str) -> rest.SparseVector:
+        counts = Counter(self.tokenize(text))
+        doc_length = sum(counts.values())
+        norm = self.k1 * (1 - self.b + self.b * doc_length / self.avg_doc_length)
+        return self._to_sparse({
+            token: tf * (self.k1 + 1) / (tf + norm)
+            for token, tf in counts.items()
+        })
+
+    def encode_documents(self, texts: List[str]) -> List[rest.SparseVector]:
+        return [self.encode_document(text) for text in texts]
+
+    def encode_query(self, text: str) -> rest.SparseVector:
+        return self._to_sparse({token: 1.0 for token in set(self.tokenize(text))})
+
+
+# Singleton instance
+sparse_encoder = SparseEncoder()
@@ -0,0 +1,11 @@
+import asyncio
+import inspect
+
+async def call_maybe_async(fn, *args, **kwargs):
+    """
+    Await `fn` if it is a coroutine function, otherwise run it in a worker thread.
+    Lets services accept either the sync or the async Qdrant collection manager.
+    """
+    if inspect.iscoroutinefunction(fn):
+        return await fn(*args, **kwargs)
+    return await asyncio.to_thread(fn, *args, **kwargs)
@@ -1,14 +1,24 @@
 import aiofiles
 import os
+import uuid
 from fastapi import UploadFile
 from src.config import Config
 
-async def save_upload_to_disk(file: UploadFile) -> str:
+# Uploads are copied to disk in blocks of this size instead of being read whole
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+async def save_upload_to_disk(file: UploadFile, unique: bool = False) -> str:
+    """Copy an upload to UPLOAD_DIR; `unique` prefixes a random id so queued files never overwrite each other."""
     os.makedirs(Config.UPLOAD_DIR, exist_ok=True)
-    file_path = os.path.join(Config.UPLOAD_DIR, os.path.basename(file.filename))
+    file_name = os.path.basename(file.filename)
+    if unique:
+        file_name = f"{uuid.uuid4().hex}_{file_name}"
+    file_path = os.path.join(Config.UPLOAD_DIR, file_name)
 
     async with aiofiles.open(file_path, "wb") as f:
-        content = await file.read()
-        await f.write(content)
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await f.write(chunk)
 
+    # Rewind so the same upload can still be streamed to R2 afterwards
+    await file.seek(0)
     return os.path.abspath(file_path)
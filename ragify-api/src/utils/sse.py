@@ -0,0 +1,6 @@
+import json
+from fastapi.encoders import jsonable_encoder
+
+def format_sse(event: str, data) -> str:
+    """Encode one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
@@ -0,0 +1,29 @@
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken ships with langchain-openai
+    tiktoken = None
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except (KeyError, ValueError):
+        pass
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # BPE files are downloaded on first use; offline hosts fall back to the estimate
+        return None
+
+
+def count_tokens(text: str, model: str = "") -> int:
+    """Count tokens for a model, falling back to a ~4 chars/token estimate without tiktoken."""
+    encoding = _get_encoding(model or "")
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
@@ -0,0 +1,95 @@
+from typing import Literal, Optional
+from pydantic import BaseModel
+from qdrant_client.http import models as rest
+from src.config import Config
+
+
+class CollectionProfile(BaseModel):
+    """Storage and index settings applied when a collection is created (or migrated)."""
+
+    name: str
+    quantization: Optional[Literal["scalar", "product", "binary"]] = None
+    quantization_always_ram: bool = True
+    rescore: bool = True
+    oversampling: float = 2.0
+    on_disk_vectors: bool = False
+    on_disk_payload: bool = False
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    search_ef: Optional[int] = None
+
+    def vector_params(self, size: int) -> rest.VectorParams:
+        return rest.VectorParams(size=size, distance=rest.Distance.COSINE, on_disk=self.on_disk_vectors)
+
+    def hnsw_config(self, tenant_indexed: bool = False) -> rest.HnswConfigDiff:
+        """
+        Global HNSW graph, or with `tenant_indexed` (the shared collection) one
+        small graph per user_id: m=0 and the profile's m as payload_m.
+        """
+        if tenant_indexed:
+            return rest.HnswConfigDiff(m=0, payload_m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+        return rest.HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+
+    def quantization_config(self):
+        if self.quantization == "scalar":
+            return rest.ScalarQuantization(scalar=rest.ScalarQuantizationConfig(
+                type=rest.ScalarType.INT8, quantile=0.99, always_ram=self.quantization_always_ram
+            ))
+        if self.quantization == "product":
+            return rest.ProductQuantization(product=rest.ProductQuantizationConfig(
+                compression=rest.CompressionRatio.X16, always_ram=self.quantization_always_ram
+            ))
+        if self.quantization == "binary":
+            return rest.BinaryQuantization(binary=rest.BinaryQuantizationConfig(
+                always_ram=self.quantization_always_ram
+            ))
+        return None
+
+    def search_params(self) -> Optional[rest.SearchParams]:
+        """Search-time HNSW ef and quantization rescoring; None keeps Qdrant's defaults."""
+        quantization = None
+        if self.quantization:
+            quantization = rest.QuantizationSearchParams(rescore=self.rescore, oversampling=self.oversampling)
+        if self.search_ef is None and quantization is None:
+            return None
+        return rest.SearchParams(hnsw_ef=self.search_ef, quantization=quantization)
+
+
+COLLECTION_PROFILES = {
+    # Plain float32 vectors and HNSW in RAM (previous behaviour)
+    "default": CollectionProfile(name="default"),
+    # int8 scalar quantization in RAM, originals on disk for rescoring: ~4x less RAM
+    "large": CollectionProfile(
+        name="large", quantization="scalar", on_disk_vectors=True, on_disk_payload=True, search_ef=128
+    ),
+    # Product quantization: ~16x less RAM, lower recall; rescoring with oversampling compensates
+    "compact": CollectionProfile(
+        name="compact", quantization="product", on_disk_vectors=True, on_disk_payload=True,
+        oversampling=3.0, search_ef=128
+    ),
+    # Binary quantization: ~32x less RAM; best with high-dimensional OpenAI embeddings
+    "binary": CollectionProfile(
+        name="binary", quantization="binary", on_disk_vectors=True, on_disk_payload=True,
+        oversampling=3.0, search_ef=128
+    ),
+}
+
+
+def get_profile(name: str = None) -> CollectionProfile:
+    """Return a named profile with QDRANT_HNSW_M / QDRANT_HNSW_EF_CONSTRUCT / QDRANT_SEARCH_EF overrides applied."""
+    name = name or Config.QDRANT_COLLECTION_PROFILE
+    try:
+        profile = COLLECTION_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown collection profile: {name}. Expected one of {sorted(COLLECTION_PROFILES)}")
+
+    overrides = {
+        field: value
+        for field, value in (
+            ("hnsw_m", Config.QDRANT_HNSW_M),
+            ("hnsw_ef_construct", Config.QDRANT_HNSW_EF_CONSTRUCT),
+            ("search_ef", Config.QDRANT_SEARCH_EF),
+        )
+        if value is not None
+    }
+    return profile.model_copy(update=overrides)
@@ -0,0 +1,64 @@
+import threading
+import time
+from typing import Dict, Iterable, Optional
+from src.config import Config
+
+
+class CollectionRegistry:
+    """
+    Process-wide record of Qdrant collections known to exist.
+    Entries expire after `ttl` seconds so collections dropped elsewhere are re-checked.
+    """
+
+    def __init__(self, ttl: float = Config.QDRANT_COLLECTION_CACHE_TTL):
+        self.ttl = ttl
+        self._expires_at: Dict[str, float] = {}
+        self._features: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def is_known(self, collection_name: str) -> bool:
+        expires_at = self._expires_at.get(collection_name)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            self.invalidate(collection_name)
+            return False
+        return True
+
+    def add(self, collection_name: str):
+        self.add_many([collection_name])
+
+    def add_many(self, collection_names: Iterable[str]):
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for name in collection_names:
+                self._expires_at[name] = expires_at
+
+    def get_features(self, collection_name: str) -> Optional[dict]:
+        """Cached facts about a collection's schema (e.g. whether it has sparse vectors)."""
+        if not self.is_known(collection_name):
+            return None
+        return self._features.get(collection_name)
+
+    def set_features(self, collection_name: str, features: dict):
+        """Record features read from the collection; it exists, so its entry is added or refreshed too."""
+        with self._lock:
+            self._features[collection_name] = features
+            self._expires_at[collection_name] = time.monotonic() + self.ttl
+
+    def invalidate(self, collection_name: Optional[str] = None):
+        """Forget one collection, or every collection when no name is given."""
+        with self._lock:
+            if collection_name is None:
+                self._expires_at.clear()
+                self._features.clear()
+            else:
+                self._expires_at.pop(collection_name, None)
+                self._features.pop(collection_name, None)
+
+    def __len__(self) -> int:
+        return len(self._expires_at)
+
+
+# Singleton instance
+collection_registry = CollectionRegistry()
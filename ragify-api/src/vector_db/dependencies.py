@@ -1,14 +1,22 @@
 from fastapi import Depends
 from src.models.users import User
-from src.vector_db.qdrant_manager import qdrant_manager
+from src.vector_db.qdrant_manager import qdrant_manager, async_qdrant_manager
 from src.auth.dependencies import get_current_user  
 
 def get_user_qdrant_manager(user: User = Depends(get_current_user)):
     """
     FastAPI dependency that returns a user-specific Qdrant collection manager.
-    Ensures the collection exists (creates if missing).
+    Ensures the collection exists (creates if missing); collections already in
+    the registry cost no Qdrant round-trip.
     """
-    collection_name = user.collection
-    manager = qdrant_manager.get_collection_manager(collection_name=collection_name)
-    manager.create_collection()  
+    manager = qdrant_manager.get_user_collection_manager(user)
+    manager.create_collection()
+    return manager
+
+async def get_user_async_qdrant_manager(user: User = Depends(get_current_user)):
+    """
+    Async variant of get_user_qdrant_manager backed by the pooled AsyncQdrantClient.
+    """
+    manager = async_qdrant_manager.get_user_collection_manager(user)
+    await manager.create_collection()
     return manager
@@ -1,6 +1,8 @@
-from qdrant_client import QdrantClient
+from qdrant_client import QdrantClient, AsyncQdrantClient
 from qdrant_client.http.exceptions import UnexpectedResponse
 from src.config import Config
+import asyncio
+import httpx
 import time
 
 def get_qdrant_client(max_retries=3, retry_interval=5):
@@ -11,7 +13,7 @@ def get_qdrant_client(max_retries=3, retry_interval=5):
             client = QdrantClient(
                 url=Config.QDRANT_URL,
                 api_key=Config.QDRANT_API_KEY,
-                timeout=10
+                timeout=Config.QDRANT_TIMEOUT
             )
             client.get_collections()  # health check
             print("✅ Qdrant connected")
@@ -24,4 +26,32 @@ def get_qdrant_client(max_retries=3, retry_interval=5):
         time.sleep(retry_interval)
     raise ConnectionError("Failed to connect to Qdrant after retries.")
 
-qdrant_client = get_qdrant_client()
+async def get_async_qdrant_client(max_retries=3, retry_interval=5):
+    """
+    Return a connected AsyncQdrantClient sharing one pooled HTTP (or gRPC) connection set.
+    Meant to be created once in the FastAPI lifespan.
+    """
+    retries = 0
+    while retries < max_retries:
+        try:
+            client = AsyncQdrantClient(
+                url=Config.QDRANT_URL,
+                api_key=Config.QDRANT_API_KEY,
+                timeout=Config.QDRANT_TIMEOUT,
+                prefer_grpc=Config.QDRANT_PREFER_GRPC,
+                grpc_port=Config.QDRANT_GRPC_PORT,
+                limits=httpx.Limits(
+                    max_connections=Config.QDRANT_POOL_SIZE,
+                    max_keepalive_connections=Config.QDRANT_POOL_SIZE
+                )
+            )
+            await client.get_collections()  # health check
+            print("✅ Qdrant (async) connected")
+            return client
+        except UnexpectedResponse as e:
+            print(f"❌ Qdrant error: {e}")
+        except Exception as e:
+            print(f"⚠️ Unexpected error: {e}")
+        retries += 1
+        await asyncio.sleep(retry_interval)
+    raise ConnectionError("Failed to connect to Qdrant after retries.")
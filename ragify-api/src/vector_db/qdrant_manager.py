@@ -1,7 +1,57 @@
 from src.config import Config
-from src.vector_db.qdrant_connection import qdrant_client
+from src.vector_db.qdrant_connection import get_qdrant_client, get_async_qdrant_client
+from src.vector_db.collection_registry import collection_registry
+from src.vector_db.collection_profiles import CollectionProfile, get_profile
 from qdrant_client.http import models as rest
-from qdrant_client.http.models import Filter, FieldCondition, MatchValue, FilterSelector
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.http.models import Filter, FieldCondition, MatchValue, MatchAny, Range, FilterSelector, HasIdCondition
+from typing import List, Optional
+from src.services.sparse_encoder import sparse_encoder
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import heapq
+import itertools
+import uuid
+
+# Name of the BM25 sparse vector stored next to the (unnamed) dense vector
+SPARSE_VECTOR_NAME = "bm25"
+
+# Payload field holding the owner in the shared (multitenant) collection
+TENANT_KEY = "user_id"
+
+# Namespace for deterministic point IDs derived from (document, chunk index)
+POINT_ID_NAMESPACE = uuid.UUID("6f1c4f0e-5a8e-4b53-9a43-1f4f2f0c8b7d")
+
+_upsert_executor = None
+
+
+def _get_upsert_executor() -> ThreadPoolExecutor:
+    """Shared pool for parallel sync upserts."""
+    global _upsert_executor
+    if _upsert_executor is None:
+        _upsert_executor = ThreadPoolExecutor(max_workers=Config.QDRANT_UPSERT_PARALLELISM)
+    return _upsert_executor
+
+
+def make_point_id(payload: dict, position: int = 0) -> str:
+    """
+    Stable point ID for a chunk: a UUIDv5 of (document id, chunk index).
+    Falls back to the file name and the chunk's position when those are not in the payload,
+    so identical text in two files no longer collides and re-ingesting overwrites in place.
+
+    Chunks carrying a content_hash (incremental ingest) are addressed by
+    (document id, content hash, occurrence) instead, so their IDs survive
+    edits elsewhere in the document that shift chunk indexes.
+    """
+    document_key = payload.get("document_id", payload.get("file_name", ""))
+    if "document_id" not in payload and "user_id" in payload:
+        # File names are only unique per tenant in the shared collection
+        document_key = f"{payload['user_id']}:{document_key}"
+    if "content_hash" in payload:
+        key = f"{document_key}:{payload['content_hash']}:{payload.get('occurrence', 0)}"
+    else:
+        key = f"{document_key}:{payload.get('chunk_index', position)}"
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, key))
 
 
 class QdrantManager:
@@ -17,81 +67,632 @@ class QdrantManager:
     def __init__(self):
         if hasattr(self, "_initialized") and self._initialized:
             return
-        if not qdrant_client:
-            raise ValueError("Qdrant client not initialized")
-        self.client = qdrant_client
+        self._client = None
         self._initialized = True
 
-    def get_collection_manager(self, collection_name: str, vector_size: int = Config.OPENAI_EMBEDDING_DIMENSION):
+    @property
+    def client(self):
+        """Connect lazily so importing this module never blocks on Qdrant."""
+        if self._client is None:
+            self._client = get_qdrant_client()
+            self.warm_up()
+        return self._client
+
+    def warm_up(self):
+        """Load the existing collection names into the registry."""
+        response = self._client.get_collections()
+        collection_registry.add_many(c.name for c in response.collections)
+
+    def get_collection_manager(self, collection_name: str, vector_size: int = Config.EMBEDDING_DIMENSION):
         """Return a per-user collection manager."""
         return UserCollectionManager(self.client, collection_name, vector_size)
 
+    def get_user_collection_manager(self, user):
+        """The user's own collection, or their tenant slice of the shared collection (QDRANT_STORAGE_LAYOUT=shared)."""
+        if Config.QDRANT_STORAGE_LAYOUT == "shared":
+            return UserCollectionManager(
+                self.client, Config.QDRANT_SHARED_COLLECTION, Config.EMBEDDING_DIMENSION, tenant_id=str(user.id)
+            )
+        return self.get_collection_manager(user.collection)
 
-class UserCollectionManager:
-    """Manager for a single Qdrant collection (per user)."""
 
-    def __init__(self, client, collection_name: str, vector_size: int):
+class AsyncQdrantManager:
+    """Singleton manager for the pooled AsyncQdrantClient, opened in the app lifespan."""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AsyncQdrantManager, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, "_initialized") and self._initialized:
+            return
+        self._client = None
+        self._initialized = True
+
+    async def connect(self):
+        if self._client is None:
+            self._client = await get_async_qdrant_client()
+            await self.warm_up()
+        return self._client
+
+    async def warm_up(self):
+        """Load the existing collection names into the registry."""
+        response = await self._client.get_collections()
+        collection_registry.add_many(c.name for c in response.collections)
+        print(f"✅ {len(response.collections)} Qdrant collection(s) registered")
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            raise ValueError("Async Qdrant client not initialized")
+        return self._client
+
+    def get_collection_manager(self, collection_name: str, vector_size: int = Config.EMBEDDING_DIMENSION):
+        """Return a per-user async collection manager."""
+        return AsyncUserCollectionManager(self.client, collection_name, vector_size)
+
+    def get_user_collection_manager(self, user):
+        """The user's own collection, or their tenant slice of the shared collection (QDRANT_STORAGE_LAYOUT=shared)."""
+        if Config.QDRANT_STORAGE_LAYOUT == "shared":
+            return AsyncUserCollectionManager(
+                self.client, Config.QDRANT_SHARED_COLLECTION, Config.EMBEDDING_DIMENSION, tenant_id=str(user.id)
+            )
+        return self.get_collection_manager(user.collection)
+
+    async def search_tenants(
+        self,
+        tenant_ids: Optional[List[str]],
+        query_vector: list,
+        limit: int = 10,
+        query_text: str = None,
+        mode: str = "dense"
+    ) -> list:
+        """Cross-tenant search in the shared collection (one query); all tenants when tenant_ids is None."""
+        manager = self.get_collection_manager(Config.QDRANT_SHARED_COLLECTION)
+        query_filter = None
+        if tenant_ids is not None:
+            query_filter = Filter(must=[FieldCondition(key=TENANT_KEY, match=MatchAny(any=tenant_ids))])
+        points, _ = await manager.retrieve(
+            query_vector, limit=limit, query_filter=query_filter, query_text=query_text, mode=mode
+        )
+        return points
+
+    async def search_many(
+        self,
+        collection_names: List[str],
+        query_vector: list,
+        limit: int = 10,
+        query_text: str = None,
+        mode: str = "dense",
+        deadline: float = Config.QDRANT_FANOUT_DEADLINE,
+        max_concurrency: int = Config.QDRANT_FANOUT_CONCURRENCY
+    ):
+        """
+        Run one query against many collections concurrently and merge the global top `limit` by score.
+        Collections that have not answered by `deadline` seconds are cancelled and reported as
+        timed out, so the call takes about as long as the slowest collection (capped by the deadline).
+        Returns (hits, report) where hits are (collection_name, scored_point) pairs.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def search_one(name: str):
+            async with semaphore:
+                manager = self.get_collection_manager(name)
+                return await manager.search(query_vector, limit=limit, query_text=query_text, mode=mode)
+
+        tasks = {asyncio.create_task(search_one(name)): name for name in dict.fromkeys(collection_names)}
+        report = {"searched": len(tasks), "timed_out": [], "failed": []}
+        if not tasks:
+            return [], report
+
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+            report["timed_out"].append(tasks[task])
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        per_collection = []
+        for task in done:
+            name = tasks[task]
+            if task.exception() is not None:
+                report["failed"].append(name)
+                continue
+            # Each result list is already sorted by score, so a heap merge yields the global order
+            per_collection.append([(name, point) for point in task.result()])
+
+        merged = heapq.merge(*per_collection, key=lambda hit: -hit[1].score)
+        return list(itertools.islice(merged, limit)), report
+
+
+class BaseCollectionManager:
+    """
+    Request builders shared by the sync and async collection managers.
+
+    With a `tenant_id` the manager works on one tenant's slice of a shared
+    collection: points carry the tenant in their `user_id` payload and every
+    read, delete and search is filtered by it.
+    """
+
+    def __init__(self, client, collection_name: str, vector_size: int, profile: CollectionProfile = None, tenant_id: str = None):
         self.client = client
         self.collection_name = collection_name
         self.vector_size = vector_size
+        self.profile = profile or get_profile()
+        self.tenant_id = tenant_id
 
-    def create_collection(self):
-        """Ensure the collection exists. Create it if missing."""
-        try:
-            self.client.get_collection(self.collection_name)
-        except Exception:
-            self.client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=rest.VectorParams(
-                    size=self.vector_size,
-                    distance=rest.Distance.COSINE
-                )
-            )
-            # Create payload index for filtering
-            self.client.create_payload_index(
-                collection_name=self.collection_name,
-                field_name="file_name",
-                field_schema=rest.PayloadSchemaType.KEYWORD
+    @property
+    def namespace(self) -> str:
+        """Key for per-tenant caches (the collection name unless the collection is shared)."""
+        if self.tenant_id is None:
+            return self.collection_name
+        return f"{self.collection_name}:{self.tenant_id}"
+
+    def _is_shared(self) -> bool:
+        return self.tenant_id is not None or self.collection_name == Config.QDRANT_SHARED_COLLECTION
+
+    def _tenant_filter(self, query_filter: Filter = None) -> Optional[Filter]:
+        """Add the tenant condition to a filter (no-op outside the shared layout)."""
+        if self.tenant_id is None:
+            return query_filter
+        tenant = FieldCondition(key=TENANT_KEY, match=MatchValue(value=self.tenant_id))
+        if query_filter is None:
+            return Filter(must=[tenant])
+        return Filter(must=[tenant, query_filter])
+
+    def _collection_params(self) -> dict:
+        # Tenant-aware indexing in the shared collection: one small HNSW graph per user_id
+        hnsw_config = self.profile.hnsw_config(tenant_indexed=self._is_shared())
+        return {
+            "collection_name": self.collection_name,
+            "vectors_config": self.profile.vector_params(self.vector_size),
+            # Qdrant applies the IDF part of BM25 server-side
+            "sparse_vectors_config": {
+                SPARSE_VECTOR_NAME: rest.SparseVectorParams(modifier=rest.Modifier.IDF)
+            },
+            "hnsw_config": hnsw_config,
+            "quantization_config": self.profile.quantization_config(),
+            "on_disk_payload": self.profile.on_disk_payload
+        }
+
+    @staticmethod
+    def _features_from_info(info) -> dict:
+        sparse_vectors = info.config.params.sparse_vectors or {}
+        dense = info.config.params.vectors
+        if isinstance(dense, dict):
+            dense = dense.get("")
+        return {
+            "sparse": SPARSE_VECTOR_NAME in sparse_vectors,
+            "indexes": set(info.payload_schema or {}),
+            "size": getattr(dense, "size", None)
+        }
+
+    def _check_vector_size(self, features: dict):
+        """Refuse to use a collection built for another embedding model's dimension."""
+        if features["size"] is not None and features["size"] != self.vector_size:
+            raise ValueError(
+                f"Collection {self.collection_name} stores {features['size']}-d vectors but the embedding "
+                f"backend produces {self.vector_size}-d vectors; re-create the collection for the new model"
             )
 
-    def insert_data(self, vectors: list, payloads: list, ids: list = None, batch_size: int = 100):
-        import hashlib
+    def _payload_indexes(self) -> list:
+        """Payload indexes used for filtering."""
+        indexes = [
+            ("file_name", rest.PayloadSchemaType.KEYWORD),
+            ("file_type", rest.PayloadSchemaType.KEYWORD),
+            ("page_number", rest.PayloadSchemaType.INTEGER),
+        ]
+        if self._is_shared():
+            indexes.insert(0, (TENANT_KEY, rest.KeywordIndexParams(type=rest.KeywordIndexType.KEYWORD, is_tenant=True)))
+        return indexes
+
+    def _missing_payload_indexes(self, features: dict) -> list:
+        return [(name, schema) for name, schema in self._payload_indexes() if name not in features["indexes"]]
+
+    @staticmethod
+    def build_filter(
+        file_names: Optional[List[str]] = None,
+        file_types: Optional[List[str]] = None,
+        page_from: Optional[int] = None,
+        page_to: Optional[int] = None
+    ) -> Optional[Filter]:
+        """Payload filter over indexed fields; None when nothing is filtered."""
+        must = []
+        if file_names:
+            must.append(FieldCondition(key="file_name", match=MatchAny(any=file_names)))
+        if file_types:
+            must.append(FieldCondition(key="file_type", match=MatchAny(any=file_types)))
+        if page_from is not None or page_to is not None:
+            must.append(FieldCondition(key="page_number", range=Range(gte=page_from, lte=page_to)))
+        return Filter(must=must) if must else None
 
-        # Generate unique IDs if not provided
+    def _point_batches(self, vectors: list, payloads: list, ids: list = None, batch_size: int = 100, sparse: bool = False) -> list:
+        """Split points into columnar Batch payloads, adding BM25 sparse vectors when the collection has them."""
+        if self.tenant_id is not None:
+            payloads = [{**p, TENANT_KEY: self.tenant_id} for p in payloads]
+        # Derive stable IDs if not provided
         if ids is None:
-            ids = [
-                int(hashlib.md5(payloads[i]["text"].encode("utf-8")).hexdigest(), 16) % (10**18)
-                for i in range(len(payloads))
-            ]
+            ids = [make_point_id(payload, i) for i, payload in enumerate(payloads)]
 
+        batches = []
         for i in range(0, len(vectors), batch_size):
-            batch_points = [
-                {"id": ids[j], "vector": vectors[i + j], "payload": payloads[i + j]}
-                for j in range(len(vectors[i:i + batch_size]))
+            batch_vectors = vectors[i:i + batch_size]
+            batch_payloads = payloads[i:i + batch_size]
+            if sparse:
+                batch_vectors = {
+                    "": batch_vectors,
+                    SPARSE_VECTOR_NAME: sparse_encoder.encode_documents([p.get("text", "") for p in batch_payloads])
+                }
+            batches.append(rest.Batch(ids=ids[i:i + batch_size], vectors=batch_vectors, payloads=batch_payloads))
+        return batches
+
+    def _search_params(self, query_vector: list, limit: int) -> dict:
+        return {
+            "collection_name": self.collection_name,
+            "query_vector": query_vector,
+            "query_filter": self._tenant_filter(),
+            "search_params": self.profile.search_params(),
+            "limit": limit,
+            "with_payload": True
+        }
+
+    def _hybrid_prefetch(self, query_vector: list, query_text: str, limit: int, prefetch_factor: int = 4, query_filter: Filter = None) -> list:
+        prefetch_limit = limit * prefetch_factor
+        query_filter = self._tenant_filter(query_filter)
+        return [
+            rest.Prefetch(query=query_vector, params=self.profile.search_params(), filter=query_filter, limit=prefetch_limit),
+            rest.Prefetch(query=sparse_encoder.encode_query(query_text), using=SPARSE_VECTOR_NAME, filter=query_filter, limit=prefetch_limit),
+        ]
+
+    def _hybrid_query_params(self, query_vector: list, query_text: str, limit: int) -> dict:
+        """Dense and BM25 candidates fused with reciprocal rank fusion inside Qdrant."""
+        return {
+            "collection_name": self.collection_name,
+            "prefetch": self._hybrid_prefetch(query_vector, query_text, limit),
+            "query": rest.FusionQuery(fusion=rest.Fusion.RRF),
+            "limit": limit,
+            "with_payload": True
+        }
+
+    def _retrieve_params(
+        self,
+        query_vector: list,
+        limit: int,
+        offset: int = 0,
+        query_filter: Filter = None,
+        score_threshold: float = None,
+        query_text: str = None,
+        hybrid: bool = False
+    ) -> dict:
+        """
+        Filtered, paginated query_points request. One extra point is requested
+        so callers can tell whether another page exists.
+        """
+        params = {
+            "collection_name": self.collection_name,
+            "limit": limit + 1,
+            "offset": offset,
+            "score_threshold": score_threshold,
+            "with_payload": True
+        }
+        if hybrid:
+            # Prefetch must cover every page up to this one
+            params["prefetch"] = self._hybrid_prefetch(query_vector, query_text, offset + limit + 1, query_filter=query_filter)
+            params["query"] = rest.FusionQuery(fusion=rest.Fusion.RRF)
+        else:
+            params["query"] = query_vector
+            params["query_filter"] = self._tenant_filter(query_filter)
+            params["search_params"] = self.profile.search_params()
+        return params
+
+    def _batch_query_requests(self, query_vectors: list, query_texts: list, limit: int, hybrid: bool) -> list:
+        """One QueryRequest per query, for query_batch_points."""
+        if hybrid:
+            return [
+                rest.QueryRequest(
+                    prefetch=self._hybrid_prefetch(vector, text, limit),
+                    query=rest.FusionQuery(fusion=rest.Fusion.RRF),
+                    limit=limit,
+                    with_payload=True
+                )
+                for vector, text in zip(query_vectors, query_texts)
             ]
-            self.client.upsert(collection_name=self.collection_name, points=batch_points)
+        return [
+            rest.QueryRequest(
+                query=vector, filter=self._tenant_filter(), params=self.profile.search_params(), limit=limit, with_payload=True
+            )
+            for vector in query_vectors
+        ]
 
-    def search(self, query_vector: list, limit: int = 5):
-        return self.client.search(
-            collection_name=self.collection_name,
-            query_vector=query_vector,
-            limit=limit,
-            with_payload=True
+    def _file_name_selector(self, file_name: str) -> FilterSelector:
+        filter_condition = Filter(
+            must=[FieldCondition(key="file_name", match=MatchValue(value=file_name))]
         )
+        return FilterSelector(filter=self._tenant_filter(filter_condition))
+
+    def _point_ids_selector(self, ids: list):
+        """Points by id; in the shared collection only the tenant's own points match."""
+        if self.tenant_id is None:
+            return rest.PointIdsList(points=ids)
+        return FilterSelector(filter=self._tenant_filter(Filter(must=[HasIdCondition(has_id=ids)])))
+
+    def _set_payload_operations(self, updates: list) -> list:
+        return [
+            rest.SetPayloadOperation(set_payload=rest.SetPayload(payload=payload, points=[point_id]))
+            for point_id, payload in updates
+        ]
 
     def get_text_from_results(self, results):
         return "\n\n".join([p.payload.get("text", "") for p in results])
 
+
+class UserCollectionManager(BaseCollectionManager):
+    """Manager for a single Qdrant collection (per user)."""
+
+    def create_collection(self):
+        """Ensure the collection exists. Create it if missing."""
+        if collection_registry.is_known(self.collection_name):
+            return
+        if not self.client.collection_exists(self.collection_name):
+            try:
+                self.client.create_collection(**self._collection_params())
+            except UnexpectedResponse as e:
+                # Another worker created it first
+                if e.status_code != 409:
+                    raise
+            else:
+                # Create payload index for filtering
+                for field_name, field_schema in self._payload_indexes():
+                    self.client.create_payload_index(
+                        collection_name=self.collection_name,
+                        field_name=field_name,
+                        field_schema=field_schema
+                    )
+        collection_registry.add(self.collection_name)
+
+    def features(self) -> dict:
+        """Schema facts about the collection (sparse vectors, size, payload indexes), cached in the registry."""
+        features = collection_registry.get_features(self.collection_name)
+        if features is None:
+            features = self._features_from_info(self.client.get_collection(self.collection_name))
+            self._check_vector_size(features)
+            collection_registry.set_features(self.collection_name, features)
+        return features
+
+    def supports_sparse(self) -> bool:
+        """Whether the collection stores BM25 vectors (collections created before hybrid search do not)."""
+        return self.features()["sparse"]
+
+    def delete_collection(self):
+        """Drop the collection and forget it in the registry (only the tenant's points when shared)."""
+        if self.tenant_id is not None:
+            self.client.delete(collection_name=self.collection_name, points_selector=FilterSelector(filter=self._tenant_filter()))
+            return
+        self.client.delete_collection(self.collection_name)
+        collection_registry.invalidate(self.collection_name)
+
+    def delete_points(self, ids: list):
+        if ids:
+            self.client.delete(collection_name=self.collection_name, points_selector=self._point_ids_selector(ids))
+
+    def update_payloads(self, updates: list):
+        """Apply (point_id, partial_payload) updates in a single request."""
+        if updates:
+            self.client.batch_update_points(
+                collection_name=self.collection_name,
+                update_operations=self._set_payload_operations(updates)
+            )
+
+    def insert_data(self, vectors: list, payloads: list, ids: list = None, batch_size: int = 100):
+        """
+        Bulk upsert. All batches but the last are sent in parallel with wait=False;
+        the last one is sent with wait=True once the others are acknowledged, and
+        since Qdrant applies updates in order it doubles as a barrier for the rest.
+        """
+        batches = self._point_batches(vectors, payloads, ids, batch_size, sparse=self.supports_sparse())
+        if not batches:
+            return
+        *head, last = batches
+
+        def upsert(batch, wait: bool):
+            return self.client.upsert(collection_name=self.collection_name, points=batch, wait=wait)
+
+        if head:
+            list(_get_upsert_executor().map(lambda batch: upsert(batch, wait=False), head))
+        upsert(last, wait=True)
+
+    def search(self, query_vector: list, limit: int = 5, query_text: str = None, mode: str = "dense"):
+        """Dense search, or dense + BM25 fused with RRF when mode is "hybrid"."""
+        if mode == "hybrid" and query_text and self.supports_sparse():
+            return self.client.query_points(**self._hybrid_query_params(query_vector, query_text, limit)).points
+        return self.client.search(**self._search_params(query_vector, limit))
+
+    def ensure_payload_indexes(self):
+        """Create filter indexes missing on collections made before they were added."""
+        features = self.features()
+        missing = self._missing_payload_indexes(features)
+        for field_name, field_schema in missing:
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=field_name,
+                field_schema=field_schema
+            )
+        features["indexes"].update(name for name, _ in missing)
+
+    def retrieve(
+        self,
+        query_vector: list,
+        limit: int = 10,
+        offset: int = 0,
+        query_filter: Filter = None,
+        score_threshold: float = None,
+        query_text: str = None,
+        mode: str = "dense"
+    ):
+        """One page of ranked points; returns (points, has_more)."""
+        if query_filter is not None:
+            self.ensure_payload_indexes()
+        hybrid = mode == "hybrid" and query_text and self.supports_sparse()
+        points = self.client.query_points(**self._retrieve_params(
+            query_vector, limit, offset, query_filter, score_threshold, query_text, hybrid
+        )).points
+        return points[:limit], len(points) > limit
+
+    def search_batch(self, query_vectors: list, limit: int = 5, query_texts: list = None, mode: str = "dense") -> list:
+        """Run several searches in one round-trip; returns one list of scored points per query."""
+        if not query_vectors:
+            return []
+        hybrid = mode == "hybrid" and query_texts is not None and self.supports_sparse()
+        responses = self.client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=self._batch_query_requests(query_vectors, query_texts, limit, hybrid)
+        )
+        return [r.points for r in responses]
+
     def delete_by_file_name(self, file_name: str):
         """Delete all vectors for a specific file."""
-        filter_condition = Filter(
-            must=[FieldCondition(key="file_name", match=MatchValue(value=file_name))]
-        )
         self.client.delete(
             collection_name=self.collection_name,
-            points_selector=FilterSelector(filter=filter_condition)
+            points_selector=self._file_name_selector(file_name)
+        )
+
+
+class AsyncUserCollectionManager(BaseCollectionManager):
+    """Async manager for a single Qdrant collection (per user); never blocks the event loop."""
+
+    async def create_collection(self):
+        """Ensure the collection exists. Create it if missing."""
+        if collection_registry.is_known(self.collection_name):
+            return
+        if not await self.client.collection_exists(self.collection_name):
+            try:
+                await self.client.create_collection(**self._collection_params())
+            except UnexpectedResponse as e:
+                # Another worker created it first
+                if e.status_code != 409:
+                    raise
+            else:
+                for field_name, field_schema in self._payload_indexes():
+                    await self.client.create_payload_index(
+                        collection_name=self.collection_name,
+                        field_name=field_name,
+                        field_schema=field_schema
+                    )
+        collection_registry.add(self.collection_name)
+
+    async def features(self) -> dict:
+        """Schema facts about the collection (sparse vectors, size, payload indexes), cached in the registry."""
+        features = collection_registry.get_features(self.collection_name)
+        if features is None:
+            features = self._features_from_info(await self.client.get_collection(self.collection_name))
+            self._check_vector_size(features)
+            collection_registry.set_features(self.collection_name, features)
+        return features
+
+    async def supports_sparse(self) -> bool:
+        """Whether the collection stores BM25 vectors (collections created before hybrid search do not)."""
+        return (await self.features())["sparse"]
+
+    async def delete_collection(self):
+        """Drop the collection and forget it in the registry (only the tenant's points when shared)."""
+        if self.tenant_id is not None:
+            await self.client.delete(collection_name=self.collection_name, points_selector=FilterSelector(filter=self._tenant_filter()))
+            return
+        await self.client.delete_collection(self.collection_name)
+        collection_registry.invalidate(self.collection_name)
+
+    async def delete_points(self, ids: list):
+        if ids:
+            await self.client.delete(collection_name=self.collection_name, points_selector=self._point_ids_selector(ids))
+
+    async def update_payloads(self, updates: list):
+        """Apply (point_id, partial_payload) updates in a single request."""
+        if updates:
+            await self.client.batch_update_points(
+                collection_name=self.collection_name,
+                update_operations=self._set_payload_operations(updates)
+            )
+
+    async def insert_data(self, vectors: list, payloads: list, ids: list = None, batch_size: int = 100):
+        """Bulk upsert; see UserCollectionManager.insert_data for the write ordering."""
+        batches = self._point_batches(vectors, payloads, ids, batch_size, sparse=await self.supports_sparse())
+        if not batches:
+            return
+        *head, last = batches
+        semaphore = asyncio.Semaphore(Config.QDRANT_UPSERT_PARALLELISM)
+
+        async def upsert(batch, wait: bool):
+            async with semaphore:
+                return await self.client.upsert(collection_name=self.collection_name, points=batch, wait=wait)
+
+        await asyncio.gather(*[upsert(batch, wait=False) for batch in head])
+        await upsert(last, wait=True)
+
+    async def search(self, query_vector: list, limit: int = 5, query_text: str = None, mode: str = "dense"):
+        """Dense search, or dense + BM25 fused with RRF when mode is "hybrid"."""
+        if mode == "hybrid" and query_text and await self.supports_sparse():
+            response = await self.client.query_points(**self._hybrid_query_params(query_vector, query_text, limit))
+            return response.points
+        return await self.client.search(**self._search_params(query_vector, limit))
+
+    async def ensure_payload_indexes(self):
+        """Create filter indexes missing on collections made before they were added."""
+        features = await self.features()
+        missing = self._missing_payload_indexes(features)
+        for field_name, field_schema in missing:
+            await self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=field_name,
+                field_schema=field_schema
+            )
+        features["indexes"].update(name for name, _ in missing)
+
+    async def retrieve(
+        self,
+        query_vector: list,
+        limit: int = 10,
+        offset: int = 0,
+        query_filter: Filter = None,
+        score_threshold: float = None,
+        query_text: str = None,
+        mode: str = "dense"
+    ):
+        """One page of ranked points; returns (points, has_more)."""
+        if query_filter is not None:
+            await self.ensure_payload_indexes()
+        hybrid = mode == "hybrid" and query_text and await self.supports_sparse()
+        response = await self.client.query_points(**self._retrieve_params(
+            query_vector, limit, offset, query_filter, score_threshold, query_text, hybrid
+        ))
+        points = response.points
+        return points[:limit], len(points) > limit
+
+    async def search_batch(self, query_vectors: list, limit: int = 5, query_texts: list = None, mode: str = "dense") -> list:
+        """Run several searches in one round-trip; returns one list of scored points per query."""
+        if not query_vectors:
+            return []
+        hybrid = mode == "hybrid" and query_texts is not None and await self.supports_sparse()
+        responses = await self.client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=self._batch_query_requests(query_vectors, query_texts, limit, hybrid)
+        )
+        return [r.points for r in responses]
+
+    async def delete_by_file_name(self, file_name: str):
+        """Delete all vectors for a specific file."""
+        await self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=self._file_name_selector(file_name)
         )
 
 
-# Singleton instance
+# Singleton instances
 qdrant_manager = QdrantManager()
+async_qdrant_manager = AsyncQdrantManager()